@@ -4,11 +4,30 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
+
+# Environment variables read by _load_env_vars
+_ENV_VARS = (
+    'OPENAI_API_KEY',
+    'GEMINI_API_KEY',
+    'OLLAMA_BASE_URL',
+    'AWS_ACCESS_KEY_ID',
+    'AWS_SECRET_ACCESS_KEY',
+)
+
+# Marks keys that are absent from the configuration in the lookup cache
+_MISSING = object()
+
 
 class Config:
     """Configuration manager"""
     
     def __init__(self, config_path: str = None):
+        self._get_cache: Dict[str, Any] = {}
         self.config_path = config_path or self._find_config()
         self.config = self._load_config()
         self._load_env_vars()
@@ -29,34 +48,34 @@ class Config:
             return self._default_config()
         
         with open(self.config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAMLLoader)
     
     def _load_env_vars(self):
         """Load sensitive data from environment variables"""
+        env = os.environ
+        openai_key, gemini_key, ollama_url, aws_access, aws_secret = (
+            env.get(name) for name in _ENV_VARS
+        )
+        
         # OpenAI API Key
-        openai_key = os.getenv('OPENAI_API_KEY')
         if openai_key:
             if 'openai' not in self.config:
                 self.config['openai'] = {}
             self.config['openai']['api_key'] = openai_key
         
         # Gemini API Key
-        gemini_key = os.getenv('GEMINI_API_KEY')
         if gemini_key:
             if 'gemini' not in self.config:
                 self.config['gemini'] = {}
             self.config['gemini']['api_key'] = gemini_key
         
         # Ollama Base URL (optional override)
-        ollama_url = os.getenv('OLLAMA_BASE_URL')
         if ollama_url:
             if 'ollama' not in self.config:
                 self.config['ollama'] = {}
             self.config['ollama']['base_url'] = ollama_url
         
         # AWS Credentials (for validation)
-        aws_access = os.getenv('AWS_ACCESS_KEY_ID')
-        aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
         if aws_access and aws_secret:
             if 'aws' not in self.config:
                 self.config['aws'] = {}
@@ -71,12 +90,14 @@ class Config:
                 'model': 'gpt-4o-mini',
                 'max_tokens': 500,
                 'temperature': 0.3,
-                'batch_size': 10
+                'batch_size': 10,
+                'max_concurrency': 10
             },
             'scanning': {
                 'max_depth': 3,
                 'max_pages': 500,
                 'rate_limit': 10,
+                'concurrency': 10,
                 'timeout': 10,
                 'user_agent': 'SenSIt/1.0 Security Scanner'
             },
@@ -97,7 +118,17 @@ class Config:
         }
     
     def get(self, key: str, default=None):
-        """Get configuration value"""
+        """Get configuration value (cached until the next set)"""
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self._lookup(key)
+            self._get_cache[key] = value
+        
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str):
+        """Walk the dotted key path through the configuration"""
         keys = key.split('.')
         value = self.config
         
@@ -105,7 +136,7 @@ class Config:
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
-                return default
+                return _MISSING
         
         return value
     
@@ -120,3 +151,4 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
+        self._get_cache.clear()
@@ -1,17 +1,101 @@
 """Main scanner orchestrator"""
 import asyncio
+import mmap
+import os
 import time
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Set, Union
 from pathlib import Path
 from models.secret import Secret, Finding
 from extraction.pattern_matcher import PatternMatcher
 from extraction.entropy_analyzer import EntropyAnalyzer
+from extraction.indexed_content import IndexedContent, decode_text, is_binary, iter_windows
 from validation.ai_validator import AIValidator
 from validation.api_validator import APIValidator
 from discovery.web_crawler import WebCrawler
 from core.config import Config
 from core.logger import logger
 
+# Files at least this large are memory-mapped and scanned in overlapping windows
+_WINDOW_THRESHOLD = 1024 * 1024
+_WINDOW_SIZE = 64 * 1024
+_WINDOW_OVERLAP = 256
+
+# Full lines each window carries past its own range: the most context any
+# extractor takes around a match (PatternMatcher's 5), which keyword checks read
+_WINDOW_CONTEXT_LINES = 5
+
+# Bytes sniffed from the start of a file to tell binary from text
+_SNIFF_SIZE = 8192
+
+# Extractors of a directory-scan worker process, built once by its pool initializer
+_worker_extractors = None
+
+
+def _iter_file_contents(file_path: str) -> Iterator[IndexedContent]:
+    """Read a file once, skipping binary files and windowing large ones over a memory map"""
+    if os.path.getsize(file_path) < _WINDOW_THRESHOLD:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        if not is_binary(data[:_SNIFF_SIZE]):
+            yield IndexedContent(decode_text(data))
+        return
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if not is_binary(mm[:_SNIFF_SIZE]):
+            yield from iter_windows(mm, _WINDOW_SIZE, _WINDOW_OVERLAP, _WINDOW_CONTEXT_LINES)
+
+
+def _extract_content(indexed: IndexedContent, location: str, pattern_matcher: PatternMatcher,
+                     entropy_analyzer: EntropyAnalyzer, seen: Optional[Set] = None) -> List[Secret]:
+    """Run both extractors over indexed content"""
+    secrets = []
+    
+    # Pattern matching
+    pattern_matches = pattern_matcher.find_matches(indexed, location)
+    secrets.extend(pattern_matches)
+    
+    # Entropy analysis
+    entropy_matches = entropy_analyzer.find_high_entropy_strings(indexed, location)
+    secrets.extend(entropy_matches)
+    
+    # Deduplicate before scoring so repeated matches are measured once
+    secrets = SecretsScanner._deduplicate_secrets(secrets, seen)
+    
+    # Calculate entropy for secrets not already scored by the entropy analysis
+    entropy_analyzer.analyze_secrets([secret for secret in secrets if secret.entropy == 0])
+    
+    return secrets
+
+
+def _extract_file(file_path: str, pattern_matcher: PatternMatcher,
+                  entropy_analyzer: EntropyAnalyzer) -> List[Secret]:
+    """Extract secrets from a file, window by window for large files"""
+    secrets = []
+    
+    # One seen set deduplicates across windows as they are extracted
+    seen = set()
+    for indexed in _iter_file_contents(file_path):
+        secrets.extend(_extract_content(indexed, file_path, pattern_matcher, entropy_analyzer, seen))
+    
+    return secrets
+
+
+def _init_scan_worker(patterns_file: str, min_entropy: float, min_length: int):
+    """Load patterns once per worker process"""
+    global _worker_extractors
+    _worker_extractors = (
+        PatternMatcher(patterns_file),
+        EntropyAnalyzer(min_entropy=min_entropy, min_length=min_length)
+    )
+
+
+def _scan_file_worker(file_path: str) -> List[Secret]:
+    """Extract secrets from one file in a worker process"""
+    return _extract_file(file_path, *_worker_extractors)
+
 
 class SecretsScanner:
     """Main secrets scanner orchestrator"""
@@ -72,6 +156,12 @@ class SecretsScanner:
         
         return finding
     
+    async def aclose(self):
+        """Close shared HTTP sessions and the AI result cache"""
+        await self.web_crawler.aclose()
+        await self.api_validator.aclose()
+        self.ai_validator.close()
+    
     async def scan_file(self, file_path: str) -> Finding:
         """Scan a single file for secrets"""
         logger.info(f"Scanning file: {file_path}")
@@ -80,12 +170,8 @@ class SecretsScanner:
         finding = Finding(target=file_path)
         
         try:
-            # Read file
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
             # Extract secrets
-            secrets = await self._extract_secrets(content, file_path)
+            secrets = _extract_file(file_path, self.pattern_matcher, self.entropy_analyzer)
             
             # Validate secrets
             validated_secrets = await self._validate_secrets(secrets)
@@ -124,28 +210,26 @@ class SecretsScanner:
             
             logger.info(f"Found {len(files)} files to scan")
             
-            # Scan each file
-            for file_path in files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    # Extract secrets
-                    secrets = await self._extract_secrets(content, str(file_path))
-                    
-                    # Add to finding
-                    for secret in secrets:
-                        finding.add_secret(secret)
-                    
-                    finding.total_files_scanned += 1
-                    
-                except Exception as e:
-                    logger.debug(f"Error scanning {file_path}: {e}")
+            # Scan files across worker processes
+            results = await self._extract_files([str(file_path) for file_path in files])
+            all_secrets = []
+            
+            for file_path, secrets in zip(files, results):
+                if isinstance(secrets, Exception):
+                    logger.warning(f"Error scanning {file_path}: {secrets}")
+                    continue
+                
+                all_secrets.extend(secrets)
+                finding.total_files_scanned += 1
             
             # Validate all secrets
-            if finding.secrets:
-                logger.info(f"Validating {len(finding.secrets)} potential secrets...")
-                finding.secrets = await self._validate_secrets(finding.secrets)
+            if all_secrets:
+                logger.info(f"Validating {len(all_secrets)} potential secrets...")
+                all_secrets = await self._validate_secrets(all_secrets)
+            
+            # Add to finding once validated
+            for secret in all_secrets:
+                finding.add_secret(secret)
             
             finding.scan_duration = time.time() - start_time
             
@@ -156,27 +240,62 @@ class SecretsScanner:
         
         return finding
     
-    async def _extract_secrets(self, content: str, location: str) -> List[Secret]:
-        """Extract secrets from content"""
-        secrets = []
+    async def _extract_files(self, file_paths: List[str]) -> List[Union[List[Secret], Exception]]:
+        """Extract secrets from many files in a process pool, one result per file"""
+        cpus = os.cpu_count() or 1
+        workers = min(self.config.get('performance.max_workers', cpus), cpus)
         
-        # Pattern matching
-        pattern_matches = self.pattern_matcher.find_matches(content, location)
-        secrets.extend(pattern_matches)
+        # Not worth starting processes for a single file or worker
+        if workers <= 1 or len(file_paths) <= 1:
+            return self._extract_files_inline(file_paths)
         
-        # Entropy analysis
-        entropy_matches = self.entropy_analyzer.find_high_entropy_strings(content, location)
-        secrets.extend(entropy_matches)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(workers)
         
-        # Calculate entropy for all secrets
-        for secret in secrets:
-            if secret.entropy == 0:
-                secret = self.entropy_analyzer.analyze_secret(secret)
+        async def extract(executor, file_path):
+            # Bound the files in flight so finished results don't pile up
+            async with semaphore:
+                return await loop.run_in_executor(executor, _scan_file_worker, file_path)
         
-        # Deduplicate
-        secrets = self._deduplicate_secrets(secrets)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scan_worker,
+            initargs=(self.pattern_matcher.patterns_file, self.entropy_analyzer.min_entropy,
+                      self.entropy_analyzer.min_length)
+        ) as executor:
+            results = await asyncio.gather(
+                *[extract(executor, file_path) for file_path in file_paths],
+                return_exceptions=True
+            )
         
-        return secrets
+        # A broken pool (failed initializer, killed worker) fails every file it still held;
+        # extract those in this process instead of reporting them as unscanned
+        broken = [i for i, result in enumerate(results) if isinstance(result, BrokenProcessPool)]
+        if broken:
+            logger.warning(f"Worker process pool failed ({results[broken[0]]}), "
+                           f"extracting {len(broken)} files in-process")
+            retried = self._extract_files_inline([file_paths[i] for i in broken])
+            for i, result in zip(broken, retried):
+                results[i] = result
+        
+        return results
+    
+    def _extract_files_inline(self, file_paths: List[str]) -> List[Union[List[Secret], Exception]]:
+        """Extract secrets from files in this process, one result per file"""
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append(_extract_file(file_path, self.pattern_matcher, self.entropy_analyzer))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def _extract_secrets(self, content: Union[str, IndexedContent], location: str) -> List[Secret]:
+        """Extract secrets from content"""
+        # Split lines and index newlines once for both extractors
+        indexed = content if isinstance(content, IndexedContent) else IndexedContent(content)
+        
+        return _extract_content(indexed, location, self.pattern_matcher, self.entropy_analyzer)
     
     async def _validate_secrets(self, secrets: List[Secret]) -> List[Secret]:
         """Validate secrets using AI and API"""
@@ -186,7 +305,7 @@ class SecretsScanner:
         # AI Validation
         if self.enable_ai and self.ai_validator.client:
             logger.info(f"Running AI validation on {len(secrets)} secrets...")
-            secrets = self.ai_validator.validate_batch(secrets)
+            secrets = await self.ai_validator.avalidate_batch(secrets)
             
             # Filter by AI confidence threshold
             high_confidence = [s for s in secrets if s.ai_confidence >= self.ai_threshold]
@@ -204,9 +323,10 @@ class SecretsScanner:
         
         return secrets
     
-    def _deduplicate_secrets(self, secrets: List[Secret]) -> List[Secret]:
-        """Remove duplicate secrets"""
-        seen = set()
+    @staticmethod
+    def _deduplicate_secrets(secrets: List[Secret], seen: Optional[Set] = None) -> List[Secret]:
+        """Remove duplicate secrets, also against keys in seen when given"""
+        seen = set() if seen is None else seen
         unique = []
         
         for secret in secrets:
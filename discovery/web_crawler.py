@@ -1,12 +1,19 @@
 """Web crawler for discovering URLs and extracting content"""
 import asyncio
 import aiohttp
+from aiolimiter import AsyncLimiter
+from collections import deque
 from urllib.parse import urljoin, urlparse
-from typing import Set, List, Dict
-from bs4 import BeautifulSoup
+from typing import Set, List, Dict, Tuple
 from core.logger import logger
 from tqdm import tqdm
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    import lxml.html
+
 
 class WebCrawler:
     """Async web crawler for discovering URLs"""
@@ -17,8 +24,20 @@ class WebCrawler:
         self.max_pages = config.get('discovery.max_pages', 50)
         self.timeout = config.get('scanning.timeout', 10)
         self.user_agent = config.get('scanning.user_agent', 'SenSIt/1.0')
+        self.rate_limit = config.get('scanning.rate_limit', 10)
+        if self.rate_limit <= 0:
+            logger.warning(f"Invalid scanning.rate_limit {self.rate_limit}, using 1 request per second")
+            self.rate_limit = 1
+        
+        # Older configs without scanning.concurrency sized it from the rate limit
+        self.concurrency = max(1, int(config.get('scanning.concurrency', self.rate_limit)))
+        
+        # Requests per second; below one, a single request per 1/rate seconds
+        self._limiter = AsyncLimiter(max(1, self.rate_limit), max(1, self.rate_limit) / self.rate_limit)
+        self._semaphore = asyncio.Semaphore(self.concurrency)  # requests in flight
         self.visited_urls = set()
         self.discovered_urls = set()
+        self._session = None
         
     async def crawl(self, start_url: str) -> Dict[str, str]:
         """
@@ -34,15 +53,21 @@ class WebCrawler:
         
         # Initialize
         pages_content = {}
-        to_visit = [(start_url, 0)]  # (url, depth)
+        to_visit = deque([(start_url, 0)])  # (url, depth)
+        enqueued = {start_url}
+        session = await self._get_session()
         
         # Create progress bar
         with tqdm(total=min(self.max_pages, 100), desc="Crawling URLs", 
                   unit="page", ncols=80) as pbar:
             
-            async with aiohttp.ClientSession() as session:
-                while to_visit and len(self.visited_urls) < self.max_pages:
-                    current_url, depth = to_visit.pop(0)
+            while to_visit and len(self.visited_urls) < self.max_pages:
+                # Take the next wave of URLs, never more than the page budget left
+                wave_size = min(self.concurrency, self.max_pages - len(self.visited_urls))
+                batch = []
+                
+                while to_visit and len(batch) < wave_size:
+                    current_url, depth = to_visit.popleft()
                     
                     # Skip if already visited
                     if current_url in self.visited_urls:
@@ -52,31 +77,60 @@ class WebCrawler:
                     if depth > self.max_depth:
                         continue
                     
-                    # Fetch page
-                    content = await self._fetch_page(session, current_url)
+                    batch.append((current_url, depth))
+                
+                # Fetch the wave concurrently
+                results = await asyncio.gather(
+                    *[self._fetch_page(session, url) for url, _ in batch],
+                    return_exceptions=True
+                )
+                
+                for (current_url, depth), content in zip(batch, results):
+                    if not content or isinstance(content, BaseException):
+                        continue
+                    
+                    self.visited_urls.add(current_url)
+                    pages_content[current_url] = content
+                    pbar.update(1)
                     
-                    if content:
-                        self.visited_urls.add(current_url)
-                        pages_content[current_url] = content
-                        pbar.update(1)
-                        
-                        # Extract links if not at max depth
-                        if depth < self.max_depth:
-                            links = self._extract_links(content, current_url)
-                            for link in links:
-                                if link not in self.visited_urls:
-                                    to_visit.append((link, depth + 1))
-        
+                    # Extract links if not at max depth
+                    if depth < self.max_depth:
+                        links = self._extract_links(content, current_url)
+                        for link in links:
+                            # Queue each URL once
+                            if link in enqueued or link in self.visited_urls:
+                                continue
+                            enqueued.add(link)
+                            to_visit.append((link, depth + 1))
+    
         logger.info(f"Crawl complete. Visited {len(self.visited_urls)} pages")
         return pages_content
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30,
+                                             ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     async def _fetch_page(self, session: aiohttp.ClientSession, url: str) -> str:
         """Fetch a single page"""
         try:
             headers = {'User-Agent': self.user_agent}
             
-            async with session.get(url, headers=headers, timeout=self.timeout, 
-                                   ssl=False) as response:
+            async with self._semaphore, self._limiter, session.get(url, headers=headers,
+                                                                   timeout=self.timeout,
+                                                                   ssl=False) as response:
                 if response.status == 200:
                     content_type = response.headers.get('Content-Type', '')
                     
@@ -98,11 +152,10 @@ class WebCrawler:
         links = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            hrefs, srcs = self._parse_link_targets(html_content)
             
             # Extract from <a> tags
-            for tag in soup.find_all('a', href=True):
-                href = tag['href']
+            for href in hrefs:
                 absolute_url = urljoin(base_url, href)
                 
                 # Only include same-domain links
@@ -113,8 +166,7 @@ class WebCrawler:
                         links.append(clean_url)
             
             # Extract from <script> tags
-            for tag in soup.find_all('script', src=True):
-                src = tag['src']
+            for src in srcs:
                 absolute_url = urljoin(base_url, src)
                 
                 if self._is_same_domain(absolute_url):
@@ -127,6 +179,18 @@ class WebCrawler:
         
         return list(set(links))[:20]  # Limit to 20 links per page
     
+    def _parse_link_targets(self, html_content: str) -> Tuple[List[str], List[str]]:
+        """Get <a href> and <script src> values using a C-backed HTML parser"""
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(html_content)
+            hrefs = [node.attributes.get('href') or '' for node in tree.css('a[href]')]
+            srcs = [node.attributes.get('src') or '' for node in tree.css('script[src]')]
+            return hrefs, srcs
+        
+        # Fallback when selectolax is not installed
+        tree = lxml.html.fromstring(html_content)
+        return tree.xpath('//a/@href'), tree.xpath('//script/@src')
+    
     def _is_same_domain(self, url: str) -> bool:
         """Check if URL belongs to same domain"""
         try:
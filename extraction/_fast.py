@@ -0,0 +1,26 @@
+"""Numba-compiled kernels for the extraction hot paths"""
+import math
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def entropy_u8(buffer, starts, ends):
+    """Shannon entropy of each buffer[start:end] byte slice"""
+    entropies = np.empty(starts.shape[0])
+    counts = np.empty(256, np.int64)
+    
+    for i in range(starts.shape[0]):
+        counts[:] = 0
+        for j in range(starts[i], ends[i]):
+            counts[buffer[j]] += 1
+        
+        length = ends[i] - starts[i]
+        entropy = 0.0
+        for count in counts:
+            if count:
+                probability = count / length
+                entropy -= probability * math.log2(probability)
+        entropies[i] = entropy
+    
+    return entropies
@@ -1,10 +1,74 @@
 """Shannon entropy analyzer for detecting high-entropy secrets"""
 import re
 import math
-from typing import List
-from models.secret import Secret
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Union
+from models.secret import ContextRef, Secret
+from extraction.indexed_content import IndexedContent
 from core.logger import logger
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from extraction._fast import entropy_u8
+except ImportError:
+    entropy_u8 = None
+
+
+# Patterns to extract potential secrets (candidates never span lines)
+_CANDIDATE_PATTERNS = [
+    # Quoted strings
+    r'["\']([A-Za-z0-9+/=_-]{12,})["\']',
+    # Assignment values
+    r'=[^\S\n]*([A-Za-z0-9+/=_-]{12,})',
+    # Environment variables
+    r'export[^\S\n]+\w+=([A-Za-z0-9+/=_-]{12,})',
+    # JSON values
+    r':[^\S\n]*["\']([A-Za-z0-9+/=_-]{12,})["\']',
+]
+
+# Strings at least this long are counted with numpy when it is installed
+_NUMPY_MIN_LENGTH = 128
+
+
+@lru_cache(maxsize=1024)
+def _plog_table(length: int) -> List[float]:
+    """Entropy term -p*log2(p) for each possible character count in a string of this length"""
+    return [0.0] + [-(count / length) * math.log2(count / length) for count in range(1, length + 1)]
+
+
+# Entropy by value, shared by every code path, since bundles repeat across
+# crawled pages; the oldest entries are dropped once it is full
+_ENTROPY_MEMO: Dict[str, float] = {}
+_ENTROPY_MEMO_SIZE = 65536
+
+
+def _remember_entropy(data: str, entropy: float):
+    """Store a measured entropy, evicting the oldest entry when the memo is full"""
+    if len(_ENTROPY_MEMO) >= _ENTROPY_MEMO_SIZE:
+        del _ENTROPY_MEMO[next(iter(_ENTROPY_MEMO))]
+    _ENTROPY_MEMO[data] = entropy
+
+
+def _entropy(data: str) -> float:
+    """Shannon entropy of a string"""
+    if not data:
+        return 0.0
+    
+    # Long ASCII strings: count all byte values in one vectorized pass
+    if np is not None and len(data) >= _NUMPY_MIN_LENGTH and data.isascii():
+        counts = np.bincount(np.frombuffer(data.encode('ascii'), dtype=np.uint8))
+        probabilities = counts[counts > 0] / len(data)
+        return float(-(probabilities * np.log2(probabilities)).sum())
+    
+    # Short strings: look up each character's term in a per-length table
+    terms = _plog_table(len(data))
+    return sum(map(terms.__getitem__, Counter(data).values()))
+
 
 class EntropyAnalyzer:
     """Analyzes entropy to detect potential secrets"""
@@ -12,91 +76,135 @@ class EntropyAnalyzer:
     def __init__(self, min_entropy: float = 3.5, min_length: int = 12):
         self.min_entropy = min_entropy
         self.min_length = min_length
+        self._candidate_res = [re.compile(pattern) for pattern in _CANDIDATE_PATTERNS]
+        
+        # Entropy never exceeds log2 of the distinct character count
+        self._min_unique = math.ceil(2 ** min_entropy)
     
     def calculate_entropy(self, data: str) -> float:
-        """Calculate Shannon entropy of a string"""
-        if not data:
-            return 0.0
-        
-        # Count character frequencies
-        frequencies = {}
-        for char in data:
-            frequencies[char] = frequencies.get(char, 0) + 1
-        
-        # Calculate entropy
-        entropy = 0.0
-        data_len = len(data)
-        
-        for count in frequencies.values():
-            probability = count / data_len
-            entropy -= probability * math.log2(probability)
-        
+        """Calculate Shannon entropy of a string (memoized)"""
+        entropy = _ENTROPY_MEMO.get(data)
+        if entropy is None:
+            entropy = _entropy(data)
+            _remember_entropy(data, entropy)
         return entropy
     
-    def find_high_entropy_strings(self, content: str, location: str = "") -> List[Secret]:
+    def find_high_entropy_strings(self, content: Union[str, IndexedContent],
+                                  location: str = "") -> List[Secret]:
         """Find high-entropy strings that might be secrets"""
         secrets = []
-        lines = content.split('\n')
-        
-        # Patterns to extract potential secrets
-        patterns = [
-            # Quoted strings
-            r'["\']([A-Za-z0-9+/=_-]{12,})["\']',
-            # Assignment values
-            r'=\s*([A-Za-z0-9+/=_-]{12,})',
-            # Environment variables
-            r'export\s+\w+=([A-Za-z0-9+/=_-]{12,})',
-            # JSON values
-            r':\s*["\']([A-Za-z0-9+/=_-]{12,})["\']',
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
+        indexed = content if isinstance(content, IndexedContent) else IndexedContent(content)
+        text = indexed.text
+        
+        # Whole-buffer pass per compiled pattern, in document order
+        matches = sorted(
+            (match for regex in self._candidate_res for match in regex.finditer(text)),
+            key=lambda match: match.start()
+        )
+        seen = set()
+        candidates = []
+        
+        for match in matches:
+            # Leave matches in a window's overlap to the neighbouring window
+            if not indexed.owns(match.start()):
+                continue
+            
+            value = match.group(1)
+            
+            # Skip captures already seen through another pattern
+            key = (value, match.start(1))
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            # Skip if too short
+            if len(value) < self.min_length:
+                continue
+            
+            # Skip if too few distinct characters to ever reach min_entropy
+            if len(set(value)) < self._min_unique:
+                continue
+            
+            candidates.append(match)
+        
+        # Calculate entropy
+        entropies = self._candidate_entropies(text, candidates)
+        
+        for match, entropy in zip(candidates, entropies):
+            # Check if entropy is high enough
+            if entropy >= self.min_entropy:
+                line_num = indexed.line_number(match.start())
+                
+                # Extract context
+                context = self._extract_context(indexed, line_num)
+                
+                secret = Secret(
+                    type="high_entropy_string",
+                    value=match.group(1),
+                    location=location,
+                    line_number=line_num,
+                    context=context,
+                    entropy=entropy,
+                    regex_match=False,
+                    severity="MEDIUM"
+                )
                 
-                for match in matches:
-                    value = match.group(1) if match.lastindex else match.group(0)
-                    
-                    # Skip if too short
-                    if len(value) < self.min_length:
-                        continue
-                    
-                    # Calculate entropy
-                    entropy = self.calculate_entropy(value)
-                    
-                    # Check if entropy is high enough
-                    if entropy >= self.min_entropy:
-                        # Extract context
-                        context = self._extract_context(lines, line_num)
-                        
-                        secret = Secret(
-                            type="high_entropy_string",
-                            value=value,
-                            location=location,
-                            line_number=line_num,
-                            context=context,
-                            entropy=entropy,
-                            regex_match=False,
-                            severity="MEDIUM"
-                        )
-                        
-                        secrets.append(secret)
+                secrets.append(secret)
         
         return secrets
     
-    def _extract_context(self, lines: List[str], line_num: int, context_lines: int = 3) -> str:
-        """Extract surrounding context"""
-        start = max(0, line_num - context_lines - 1)
-        end = min(len(lines), line_num + context_lines)
+    def _candidate_entropies(self, text: str, candidates: List[re.Match]) -> List[float]:
+        """
+        Entropy of each candidate's capture. Only distinct values missing from
+        the memo are measured, in one compiled pass when numba is available.
+        """
+        values = [match.group(1) for match in candidates]
         
-        context_lines_list = lines[start:end]
-        return '\n'.join(context_lines_list)
+        # First occurrence of each distinct value not measured before
+        missing = {}
+        for value, match in zip(values, candidates):
+            if value not in missing and value not in _ENTROPY_MEMO:
+                missing[value] = match
+        
+        # Captures are ASCII, so byte offsets equal character offsets on ASCII text
+        if entropy_u8 is not None and missing and text.isascii():
+            buffer = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            starts = np.fromiter((match.start(1) for match in missing.values()), dtype=np.int64, count=len(missing))
+            ends = np.fromiter((match.end(1) for match in missing.values()), dtype=np.int64, count=len(missing))
+            for value, entropy in zip(missing, entropy_u8(buffer, starts, ends).tolist()):
+                _remember_entropy(value, entropy)
+        
+        return [self.calculate_entropy(value) for value in values]
+    
+    def _extract_context(self, indexed: IndexedContent, line_num: int, context_lines: int = 3) -> ContextRef:
+        """Reference surrounding context, rendered only when reported"""
+        return indexed.context_ref(line_num, context_lines)
     
     def analyze_secret(self, secret: Secret) -> Secret:
         """Analyze entropy of an existing secret"""
         secret.entropy = self.calculate_entropy(secret.value)
         return secret
     
+    def analyze_secrets(self, secrets: List[Secret]) -> List[Secret]:
+        """Analyze entropy of existing secrets, in one compiled pass when numba is available"""
+        values = [secret.value for secret in secrets]
+        joined = ''.join(values)
+        
+        if entropy_u8 is None or not values or not joined.isascii():
+            for secret in secrets:
+                self.analyze_secret(secret)
+            return secrets
+        
+        # Score each value as a slice of the concatenated values
+        ends = np.cumsum([len(value) for value in values], dtype=np.int64)
+        starts = ends - np.array([len(value) for value in values], dtype=np.int64)
+        entropies = entropy_u8(np.frombuffer(joined.encode('ascii'), dtype=np.uint8), starts, ends)
+        
+        for secret, entropy in zip(secrets, entropies.tolist()):
+            secret.entropy = entropy
+        
+        return secrets
+    
     def is_base64(self, data: str) -> bool:
         """Check if string is likely base64 encoded"""
         # Base64 pattern
@@ -0,0 +1,134 @@
+"""Indexed view of scanned content shared by the extractors"""
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+from models.secret import ContextRef
+
+
+_NEWLINE_RE = re.compile('\n')
+
+# Control bytes other than tab, newline, vertical tab, form feed and carriage return
+_CONTROL_BYTES = bytes(range(9)) + bytes(range(14, 32))
+_NON_CONTROL_BYTES = bytes(byte for byte in range(256) if byte not in _CONTROL_BYTES)
+
+# Sniffed content with more control bytes than this is treated as binary
+_BINARY_THRESHOLD = 0.30
+
+
+@dataclass
+class IndexedContent:
+    """Content with its newline offsets indexed once for line and context lookups"""
+    
+    text: str
+    
+    # Window metadata when text is a slice of a larger buffer: lines before
+    # the slice, and the range of text matches must start in to be reported
+    line_offset: int = 0
+    start: int = 0
+    end: Optional[int] = None
+    
+    nl_offsets: List[int] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.nl_offsets = [m.start() for m in _NEWLINE_RE.finditer(self.text)]
+    
+    def line_number(self, offset: int) -> int:
+        """Get the 1-based line number of a character offset"""
+        return bisect_left(self.nl_offsets, offset) + 1 + self.line_offset
+    
+    def context_ref(self, line_num: int, context_lines: int) -> ContextRef:
+        """Reference the lines around a 1-based line number without copying them"""
+        local = line_num - self.line_offset
+        first = max(0, local - context_lines - 1)
+        last = min(len(self.nl_offsets) + 1, local + context_lines)
+        
+        start = self.nl_offsets[first - 1] + 1 if first > 0 else 0
+        end = self.nl_offsets[last - 1] if last - 1 < len(self.nl_offsets) else len(self.text)
+        return ContextRef(self.text, start, end)
+    
+    def owns(self, offset: int) -> bool:
+        """Check if a match starting at offset belongs to this window"""
+        return self.start <= offset and (self.end is None or offset < self.end)
+
+
+def is_binary(head: bytes) -> bool:
+    """Sniff whether the first bytes of a file look binary rather than text"""
+    if not head:
+        return False
+    
+    # A NUL byte never appears in text; otherwise count control bytes at C speed
+    if b'\0' in head:
+        return True
+    return len(head.translate(None, _NON_CONTROL_BYTES)) / len(head) > _BINARY_THRESHOLD
+
+
+def decode_text(data: bytes) -> str:
+    """Decode like a text-mode read with errors ignored (universal newlines)"""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _line_start_before(buffer, offset: int, lines: int, limit: int) -> int:
+    """Offset of the start of the line `lines` lines above the one at offset, never below limit"""
+    start = buffer.rfind(b'\n', limit, offset) + 1 or limit
+    for _ in range(lines):
+        if start <= limit:
+            return limit
+        start = buffer.rfind(b'\n', limit, start - 1) + 1 or limit
+    return max(start, limit)
+
+
+def _line_end_after(buffer, offset: int, lines: int, limit: int) -> int:
+    """Offset just past the `lines` full lines that follow offset, never beyond limit"""
+    end = offset
+    
+    # Finish the line offset is in, unless it starts one
+    if 0 < end < limit and buffer[end - 1:end] != b'\n':
+        end = buffer.find(b'\n', end, limit) + 1 or limit
+    
+    for _ in range(lines):
+        if end >= limit:
+            return limit
+        end = buffer.find(b'\n', end, limit) + 1 or limit
+    return end
+
+
+def iter_windows(buffer, size: int, overlap: int, context_lines: int = 0) -> Iterator[IndexedContent]:
+    """
+    Split a bytes-like buffer (e.g. an mmap) into decoded windows of about
+    `size` bytes, cut after a newline where possible. Each window carries
+    `overlap` bytes on both sides so matches crossing a boundary are seen
+    whole, grown to at least `context_lines` full lines so a match's
+    context is never cut at the window edge (up to `size` bytes per side,
+    for files with very long lines). Only matches starting in a window's
+    own range are reported by it.
+    """
+    total = len(buffer)
+    own_start = 0
+    line_offset = 0
+    
+    while own_start < total:
+        own_end = min(own_start + size, total)
+        if own_end < total:
+            cut = buffer.rfind(b'\n', own_start, own_end)
+            if cut != -1:
+                own_end = cut + 1
+        
+        lead_start = min(max(0, own_start - overlap),
+                         _line_start_before(buffer, own_start, context_lines, max(0, own_start - size)))
+        tail_end = max(min(total, own_end + overlap),
+                       _line_end_after(buffer, own_end, context_lines, min(total, own_end + size)))
+        
+        lead = decode_text(buffer[lead_start:own_start])
+        own = decode_text(buffer[own_start:own_end])
+        tail = decode_text(buffer[own_end:tail_end])
+        
+        yield IndexedContent(
+            lead + own + tail,
+            line_offset=line_offset - lead.count('\n'),
+            start=len(lead),
+            end=len(lead) + len(own)
+        )
+        
+        line_offset += own.count('\n')
+        own_start = own_end
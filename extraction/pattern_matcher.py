@@ -2,10 +2,22 @@
 import re
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any
-from models.secret import Secret
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+from models.secret import ContextRef, Secret
+from extraction.indexed_content import IndexedContent
 from core.logger import logger
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 class PatternMatcher:
     """Regex-based pattern matcher"""
@@ -13,6 +25,9 @@ class PatternMatcher:
     def __init__(self, patterns_file: str = None):
         self.patterns_file = patterns_file or self._find_patterns_file()
         self.patterns = self._load_patterns()
+        self._compiled = self._compile_patterns()
+        self._by_ext = self._group_by_file_type()
+        self._hs_db, self._hs_unsupported = self._build_prefilter()
     
     def _find_patterns_file(self) -> str:
         """Find patterns.yml file"""
@@ -24,15 +39,14 @@ class PatternMatcher:
         """Load patterns from YAML file"""
         try:
             with open(self.patterns_file, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YAMLLoader)
         except Exception as e:
             logger.error(f"Error loading patterns: {e}")
             return {}
     
-    def find_matches(self, content: str, location: str = "", file_type: str = "") -> List[Secret]:
-        """Find all pattern matches in content"""
-        secrets = []
-        lines = content.split('\n')
+    def _compile_patterns(self) -> List[Tuple[str, re.Pattern, Dict[str, Any]]]:
+        """Compile every pattern once at load time"""
+        compiled = []
         
         for pattern_name, pattern_config in self.patterns.items():
             pattern = pattern_config.get('pattern')
@@ -40,50 +54,159 @@ class PatternMatcher:
                 continue
             
             try:
-                # Compile regex
                 regex = re.compile(pattern, re.MULTILINE | re.IGNORECASE)
-                
-                # Find matches
-                for match in regex.finditer(content):
-                    matched_value = match.group(0)
-                    
-                    # Find line number
-                    line_num = content[:match.start()].count('\n') + 1
-                    
-                    # Extract context
-                    context = self._extract_context(lines, line_num, context_lines=5)
-                    
-                    # Check context keywords if specified
-                    if 'context_keywords' in pattern_config:
-                        if not self._check_context_keywords(context, pattern_config['context_keywords']):
-                            continue
-                    
-                    # Create secret object
-                    secret = Secret(
-                        type=pattern_name,
-                        value=matched_value,
-                        location=location,
-                        line_number=line_num,
-                        context=context,
-                        file_type=file_type,
-                        regex_match=True,
-                        severity=pattern_config.get('severity', 'MEDIUM')
-                    )
-                    
-                    secrets.append(secret)
-                    
+                compiled.append((pattern_name, regex, pattern_config))
             except re.error as e:
                 logger.error(f"Invalid regex pattern for {pattern_name}: {e}")
         
+        return compiled
+    
+    def _build_prefilter(self) -> Tuple[Optional[Any], Set[str]]:
+        """
+        Compile all signatures into one Hyperscan database. Hyperscan only
+        tells which signatures occur at all; those are then matched with re
+        so results keep re's semantics. Returns the database (None without
+        hyperscan) and the names of signatures Hyperscan cannot compile.
+        """
+        if hyperscan is None or not self._compiled:
+            return None, set()
+        
+        indices = list(range(len(self._compiled)))
+        try:
+            return self._compile_hyperscan(indices), set()
+        except hyperscan.error:
+            pass
+        
+        # Find the signatures Hyperscan rejects; they always run through re
+        supported = []
+        unsupported = set()
+        for index in indices:
+            try:
+                self._compile_hyperscan([index])
+                supported.append(index)
+            except hyperscan.error as e:
+                logger.debug(f"Hyperscan cannot compile {self._compiled[index][0]}: {e}")
+                unsupported.add(self._compiled[index][0])
+        
+        if not supported:
+            return None, set()
+        return self._compile_hyperscan(supported), unsupported
+    
+    def _compile_hyperscan(self, indices: List[int]):
+        """Compile the given signatures into a block-mode Hyperscan database"""
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[self._compiled[index][1].pattern.encode() for index in indices],
+            ids=indices,
+            elements=len(indices),
+            flags=[flags] * len(indices)
+        )
+        return database
+    
+    def _prefilter(self, content: str) -> Optional[Set[str]]:
+        """Names of signatures occurring in content, or None to run them all"""
+        # re's Unicode case folding and classes differ from Hyperscan's on non-ASCII text
+        if self._hs_db is None or not content.isascii():
+            return None
+        
+        hits = set(self._hs_unsupported)
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(self._compiled[pattern_id][0])
+        
+        self._hs_db.scan(content.encode('ascii'), match_event_handler=on_match)
+        return hits
+    
+    def _group_by_file_type(self) -> Dict[str, List[Tuple[str, re.Pattern, Dict[str, Any]]]]:
+        """Precompute the patterns to run per file type, '*' holding the universal ones"""
+        file_types = {}
+        for pattern_name, regex, pattern_config in self._compiled:
+            for file_type in pattern_config.get('file_types') or []:
+                file_types.setdefault(pattern_name, set()).add(self._normalize_file_type(file_type))
+        
+        extensions = set().union(*file_types.values())
+        by_ext = {}
+        
+        # Keep patterns.yml order within each bucket
+        for ext in extensions | {'*'}:
+            by_ext[ext] = [
+                entry for entry in self._compiled
+                if entry[0] not in file_types or ext in file_types[entry[0]]
+            ]
+        
+        return by_ext
+    
+    @staticmethod
+    def _normalize_file_type(file_type: str) -> str:
+        """Lowercase a file type and give it a leading dot"""
+        file_type = file_type.lower()
+        return file_type if file_type.startswith('.') else f'.{file_type}'
+    
+    def _file_type_for(self, location: str) -> str:
+        """Derive the file type from a path or URL (the name for dotfiles like .env)"""
+        path = Path(urlparse(location).path if '://' in location else location)
+        return path.suffix.lower() or self._normalize_file_type(path.name)
+    
+    def find_matches(self, content: Union[str, IndexedContent], location: str = "",
+                     file_type: str = "") -> List[Secret]:
+        """Find all pattern matches in content"""
+        secrets = []
+        indexed = content if isinstance(content, IndexedContent) else IndexedContent(content)
+        content = indexed.text
+        
+        # Only run the patterns relevant to this file type
+        ext = self._normalize_file_type(file_type) if file_type else self._file_type_for(location)
+        patterns = self._by_ext.get(ext, self._by_ext['*'])
+        
+        # One Hyperscan pass finds which signatures can match at all
+        hits = self._prefilter(content)
+        
+        for pattern_name, regex, pattern_config in patterns:
+            if hits is not None and pattern_name not in hits:
+                continue
+            
+            for match in regex.finditer(content):
+                # Leave matches in a window's overlap to the neighbouring window
+                if not indexed.owns(match.start()):
+                    continue
+                
+                secret = self._create_secret(
+                    match, pattern_name, pattern_config, indexed, location, file_type
+                )
+                
+                # Check context keywords if specified
+                if 'context_keywords' in pattern_config:
+                    if not self._check_context_keywords(secret.get_context(), pattern_config['context_keywords']):
+                        continue
+                
+                secrets.append(secret)
+        
         return secrets
     
-    def _extract_context(self, lines: List[str], line_num: int, context_lines: int = 5) -> str:
-        """Extract surrounding context"""
-        start = max(0, line_num - context_lines - 1)
-        end = min(len(lines), line_num + context_lines)
+    def _create_secret(self, match: re.Match, pattern_name: str, pattern_config: Dict[str, Any],
+                       indexed: IndexedContent, location: str, file_type: str) -> Secret:
+        """Build a Secret from a regex match"""
+        # Find line number
+        line_num = indexed.line_number(match.start())
         
-        context_lines_list = lines[start:end]
-        return '\n'.join(context_lines_list)
+        # Extract context
+        context = self._extract_context(indexed, line_num, context_lines=5)
+        
+        return Secret(
+            type=pattern_name,
+            value=match.group(0),
+            location=location,
+            line_number=line_num,
+            context=context,
+            file_type=file_type,
+            regex_match=True,
+            severity=pattern_config.get('severity', 'MEDIUM')
+        )
+    
+    def _extract_context(self, indexed: IndexedContent, line_num: int, context_lines: int = 5) -> ContextRef:
+        """Reference surrounding context, rendered only when reported"""
+        return indexed.context_ref(line_num, context_lines)
     
     def _check_context_keywords(self, context: str, keywords: List[str]) -> bool:
         """Check if context contains required keywords"""
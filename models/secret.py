@@ -1,10 +1,41 @@
 """Data models for secrets"""
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Optional, Dict, Any, Union
 from datetime import datetime
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Labels Finding reports counts for, in display order
+_SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+_STATUSES = ("CONFIRMED", "LIKELY", "POSSIBLE", "UNVERIFIED")
+
+
+@dataclass(**_SLOTS)
+class ContextRef:
+    """Lazy reference to a secret's surrounding lines in the scanned text"""
+    
+    text: str = field(repr=False)
+    start: int
+    end: int
+    
+    def render(self) -> str:
+        """Slice the context out of the scanned text"""
+        return self.text[self.start:self.end]
+    
+    def __bool__(self) -> bool:
+        return self.end > self.start
+    
+    def __reduce__(self):
+        # Pickle as the rendered context rather than the whole scanned text
+        return (str, (self.render(),))
+
+
+@dataclass(**_SLOTS)
 class Secret:
     """Represents a detected secret"""
     
@@ -14,8 +45,8 @@ class Secret:
     location: str
     line_number: int = 0
     
-    # Context
-    context: str = ""
+    # Context (a ContextRef until rendered)
+    context: Union[str, ContextRef] = ""
     file_type: str = ""
     
     # Analysis scores
@@ -32,17 +63,47 @@ class Secret:
     severity: str = "MEDIUM"  # CRITICAL, HIGH, MEDIUM, LOW
     status: str = "UNVERIFIED"  # CONFIRMED, LIKELY, POSSIBLE, UNVERIFIED
     
-    # Metadata
-    discovered_at: datetime = field(default_factory=datetime.now)
+    # Metadata (epoch seconds, converted to ISO format only when exported)
+    discovered_at: float = field(default_factory=time.time)
+    
+    # Last to_dict result, with the validation state it was built from
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _dict_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Share one copy of the few distinct labels so comparisons and lookups hit identity
+        self.type = sys.intern(self.type)
+        self.file_type = sys.intern(self.file_type)
+        self.severity = sys.intern(self.severity)
+        self.status = sys.intern(self.status)
+    
+    def __reduce__(self):
+        # Rebuild through __init__ so secrets from worker processes are interned too
+        return (Secret, tuple(getattr(self, name) for name in _SECRET_INIT_FIELDS))
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """
+        Convert to dictionary. The result is a shallow copy of a cached dict,
+        so callers must not mutate nested values such as api_details.
+        """
+        # Reuse the last result unless validation has updated the secret since;
+        # api_details is snapshotted so changes made to it in place are seen too
+        key = (self.entropy, self.ai_confidence, self.ai_reasoning, self.api_valid,
+               tuple(sorted(self.api_details.items())), self.severity, self.status)
+        if self._dict_cache is None or key != self._dict_key:
+            self._dict_cache = self._build_dict()
+            self._dict_key = key
+        
+        return dict(self._dict_cache)
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the dictionary form, rendering context and truncating the value"""
         return {
             'type': self.type,
             'value': self.value[:20] + '...' if len(self.value) > 20 else self.value,
             'location': self.location,
             'line_number': self.line_number,
-            'context': self.context,
+            'context': self.get_context(),
             'entropy': round(self.entropy, 2),
             'ai_confidence': round(self.ai_confidence, 2),
             'ai_reasoning': self.ai_reasoning,
@@ -50,9 +111,15 @@ class Secret:
             'api_details': self.api_details,
             'severity': self.severity,
             'status': self.status,
-            'discovered_at': self.discovered_at.isoformat()
+            'discovered_at': datetime.fromtimestamp(self.discovered_at).isoformat()
         }
     
+    def get_context(self) -> str:
+        """Get the context text, rendering a lazy reference on demand"""
+        if isinstance(self.context, ContextRef):
+            return self.context.render()
+        return self.context
+    
     def get_score(self) -> float:
         """Calculate overall confidence score"""
         score = 0.0
@@ -77,21 +144,37 @@ class Secret:
         return min(score, 100)
 
 
-@dataclass
+_SECRET_INIT_FIELDS = tuple(f.name for f in fields(Secret) if f.init)
+
+
+@dataclass(**_SLOTS)
 class Finding:
     """Represents a scan finding"""
     
     target: str
     secrets: list[Secret] = field(default_factory=list)
     total_files_scanned: int = 0
-    total_secrets_found: int = 0
     scan_duration: float = 0.0
     scan_timestamp: datetime = field(default_factory=datetime.now)
     
     def add_secret(self, secret: Secret):
         """Add a secret to findings"""
         self.secrets.append(secret)
-        self.total_secrets_found += 1
+    
+    def severity_counts(self) -> Dict[str, int]:
+        """Count secrets per known severity in one pass"""
+        counts = Counter(map(attrgetter('severity'), self.secrets))
+        return {severity: counts[severity] for severity in _SEVERITIES}
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Count secrets per known status in one pass"""
+        counts = Counter(map(attrgetter('status'), self.secrets))
+        return {status: counts[status] for status in _STATUSES}
+    
+    @property
+    def total_secrets_found(self) -> int:
+        """Number of secrets in the finding"""
+        return len(self.secrets)
     
     def get_critical_secrets(self) -> list[Secret]:
         """Get all critical severity secrets"""
@@ -1,20 +1,36 @@
 """CLI output reporter"""
+import sys
+from types import MappingProxyType
+from typing import List
 from colorama import Fore, Style, init
-from tabulate import tabulate
 from models.secret import Finding, Secret
 
 init(autoreset=True)
 
+# Color codes resolved once instead of per printed line
+_SEVERITY_COLORS = MappingProxyType({
+    "CRITICAL": Fore.RED,
+    "HIGH": Fore.YELLOW,
+    "MEDIUM": Fore.BLUE,
+    "LOW": Fore.WHITE
+})
 
-class CLIReporter:
-    """Beautiful CLI output"""
-    
-    def __init__(self, verbose: bool = True):
-        self.verbose = verbose
-    
-    def print_banner(self):
-        """Print SenSIt banner"""
-        banner = f"""
+_STATUS_ICONS = MappingProxyType({
+    "CONFIRMED": f"{Fore.RED}✓ CONFIRMED",
+    "LIKELY": f"{Fore.YELLOW}~ LIKELY",
+    "POSSIBLE": f"{Fore.BLUE}? POSSIBLE",
+    "UNVERIFIED": f"{Fore.WHITE}○ UNVERIFIED"
+})
+
+# Left border of a secret's box, per severity color
+_BARS = {color: f"{color}│{Style.RESET_ALL}" for color in _SEVERITY_COLORS.values()}
+
+_RULE = f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}"
+_PLUS = f"{Fore.GREEN}[+]{Style.RESET_ALL}"
+_API_VALID = f"{Fore.GREEN}✓ Valid"
+_API_INVALID = f"{Fore.RED}✗ Invalid"
+
+_BANNER = f"""
 {Fore.CYAN}╔═══════════════════════════════════════════════════════════════╗
 ║                                                               ║
 ║   {Fore.GREEN}███████{Fore.CYAN}╗{Fore.GREEN}███████{Fore.CYAN}╗{Fore.GREEN}███{Fore.CYAN}╗   {Fore.GREEN}██{Fore.CYAN}╗{Fore.GREEN}███████{Fore.CYAN}╗{Fore.GREEN}██{Fore.CYAN}╗{Fore.GREEN}████████{Fore.CYAN}╗          ║
@@ -28,124 +44,195 @@ class CLIReporter:
 ║                    {Fore.WHITE}v1.0.0 - by viruz{Fore.CYAN}                       ║
 ╚═══════════════════════════════════════════════════════════════╝{Style.RESET_ALL}
 """
-        print(banner)
+
+_SUMMARY_HEADERS = ("Type", "Severity", "Status", "AI Conf", "API", "Location")
+
+
+
+def _compile_secret_template(color: str) -> str:
+    """Build the fixed head of a secret's box for one severity color, with codes inlined"""
+    bar = _BARS[color]
+    return '\n'.join([
+        f"{color}┌─ Secret #{{index}} ─ {{severity}} ─────────────────────────────────{Style.RESET_ALL}",
+        bar,
+        f"{bar} Type: {Fore.WHITE}{{type}}{Style.RESET_ALL}",
+        f"{bar} Status: {{status}}{Style.RESET_ALL}",
+        f"{bar} Location: {Fore.CYAN}{{location}}:{{line_number}}{Style.RESET_ALL}",
+        f"{bar} Value: {Fore.YELLOW}{{value}}{Style.RESET_ALL}",
+        bar,
+        f"{bar} Entropy: {{entropy:.2f}}",
+        f"{bar} AI Confidence: {{ai_confidence:.0f}}%",
+    ])
+
+
+_SECRET_TEMPLATES = MappingProxyType({
+    severity: _compile_secret_template(color) for severity, color in _SEVERITY_COLORS.items()
+})
+_DEFAULT_SECRET_TEMPLATE = _compile_secret_template(Fore.WHITE)
+
+
+def _write(parts: List[str]):
+    """Write output lines to stdout in one call and flush once"""
+    sys.stdout.write('\n'.join(parts) + '\n')
+    sys.stdout.flush()
+
+
+class CLIReporter:
+    """Beautiful CLI output"""
+    
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
+    
+    def print_banner(self):
+        """Print SenSIt banner"""
+        print(_BANNER)
     
     def print_finding(self, finding: Finding):
         """Print scan results"""
-        print(f"\n{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Scan Results for: {Fore.WHITE}{finding.target}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+        _write(self._format_finding(finding))
+    
+    def print_secret(self, secret: Secret, index: int = 1):
+        """Print a single secret"""
+        _write(self._format_secret(secret, index))
+    
+    def _format_finding(self, finding: Finding) -> List[str]:
+        """Format scan results as output lines"""
+        parts = [
+            f"\n{_RULE}",
+            f"{Fore.YELLOW}Scan Results for: {Fore.WHITE}{finding.target}{Style.RESET_ALL}",
+            f"{_RULE}\n",
+        ]
         
         # Summary
-        print(f"{Fore.GREEN}[+]{Style.RESET_ALL} Files scanned: {finding.total_files_scanned}")
-        print(f"{Fore.GREEN}[+]{Style.RESET_ALL} Total secrets found: {finding.total_secrets_found}")
-        print(f"{Fore.GREEN}[+]{Style.RESET_ALL} Scan duration: {finding.scan_duration:.2f}s")
+        parts.append(f"{_PLUS} Files scanned: {finding.total_files_scanned}")
+        parts.append(f"{_PLUS} Total secrets found: {finding.total_secrets_found}")
+        parts.append(f"{_PLUS} Scan duration: {finding.scan_duration:.2f}s")
         
         # Count by severity
-        critical = len([s for s in finding.secrets if s.severity == "CRITICAL"])
-        high = len([s for s in finding.secrets if s.severity == "HIGH"])
-        medium = len([s for s in finding.secrets if s.severity == "MEDIUM"])
-        low = len([s for s in finding.secrets if s.severity == "LOW"])
+        severity_counts = finding.severity_counts()
+        critical = severity_counts["CRITICAL"]
+        high = severity_counts["HIGH"]
+        medium = severity_counts["MEDIUM"]
+        low = severity_counts["LOW"]
         
-        print(f"\n{Fore.CYAN}Severity Breakdown:{Style.RESET_ALL}")
+        parts.append(f"\n{Fore.CYAN}Severity Breakdown:{Style.RESET_ALL}")
         if critical > 0:
-            print(f"  {Fore.RED}● CRITICAL: {critical}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.RED}● CRITICAL: {critical}{Style.RESET_ALL}")
         if high > 0:
-            print(f"  {Fore.YELLOW}● HIGH: {high}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.YELLOW}● HIGH: {high}{Style.RESET_ALL}")
         if medium > 0:
-            print(f"  {Fore.BLUE}● MEDIUM: {medium}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.BLUE}● MEDIUM: {medium}{Style.RESET_ALL}")
         if low > 0:
-            print(f"  {Fore.WHITE}● LOW: {low}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.WHITE}● LOW: {low}{Style.RESET_ALL}")
         
         # Count by status
-        confirmed = len([s for s in finding.secrets if s.status == "CONFIRMED"])
-        likely = len([s for s in finding.secrets if s.status == "LIKELY"])
+        status_counts = finding.status_counts()
+        confirmed = status_counts["CONFIRMED"]
+        likely = status_counts["LIKELY"]
         
-        print(f"\n{Fore.CYAN}Validation Status:{Style.RESET_ALL}")
+        parts.append(f"\n{Fore.CYAN}Validation Status:{Style.RESET_ALL}")
         if confirmed > 0:
-            print(f"  {Fore.RED}✓ CONFIRMED (Live API): {confirmed}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.RED}✓ CONFIRMED (Live API): {confirmed}{Style.RESET_ALL}")
         if likely > 0:
-            print(f"  {Fore.YELLOW}~ LIKELY (High AI confidence): {likely}{Style.RESET_ALL}")
+            parts.append(f"  {Fore.YELLOW}~ LIKELY (High AI confidence): {likely}{Style.RESET_ALL}")
         
-        # Print secrets
+        # Format secrets
         if finding.secrets:
-            print(f"\n{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}Detected Secrets:{Style.RESET_ALL}\n")
+            parts.append(f"\n{_RULE}")
+            parts.append(f"{Fore.YELLOW}Detected Secrets:{Style.RESET_ALL}\n")
             
             for i, secret in enumerate(finding.secrets, 1):
-                self.print_secret(secret, i)
+                parts.extend(self._format_secret(secret, i))
         else:
-            print(f"\n{Fore.GREEN}✓ No secrets found!{Style.RESET_ALL}")
+            parts.append(f"\n{Fore.GREEN}✓ No secrets found!{Style.RESET_ALL}")
+        
+        return parts
     
-    def print_secret(self, secret: Secret, index: int = 1):
-        """Print a single secret"""
+    def _format_secret(self, secret: Secret, index: int = 1) -> List[str]:
+        """Format a single secret as output lines"""
         # Color based on severity
-        severity_colors = {
-            "CRITICAL": Fore.RED,
-            "HIGH": Fore.YELLOW,
-            "MEDIUM": Fore.BLUE,
-            "LOW": Fore.WHITE
-        }
-        color = severity_colors.get(secret.severity, Fore.WHITE)
+        color = _SEVERITY_COLORS.get(secret.severity, Fore.WHITE)
+        bar = _BARS[color]
         
         # Status icon
-        status_icons = {
-            "CONFIRMED": f"{Fore.RED}✓ CONFIRMED",
-            "LIKELY": f"{Fore.YELLOW}~ LIKELY",
-            "POSSIBLE": f"{Fore.BLUE}? POSSIBLE",
-            "UNVERIFIED": f"{Fore.WHITE}○ UNVERIFIED"
-        }
-        status = status_icons.get(secret.status, "○ UNKNOWN")
-        
-        print(f"{color}┌─ Secret #{index} ─ {secret.severity} ─────────────────────────────────{Style.RESET_ALL}")
-        print(f"{color}│{Style.RESET_ALL}")
-        print(f"{color}│{Style.RESET_ALL} Type: {Fore.WHITE}{secret.type}{Style.RESET_ALL}")
-        print(f"{color}│{Style.RESET_ALL} Status: {status}{Style.RESET_ALL}")
-        print(f"{color}│{Style.RESET_ALL} Location: {Fore.CYAN}{secret.location}:{secret.line_number}{Style.RESET_ALL}")
+        status = _STATUS_ICONS.get(secret.status, "○ UNKNOWN")
         
         # Truncate value for display
         display_value = secret.value[:60] + '...' if len(secret.value) > 60 else secret.value
-        print(f"{color}│{Style.RESET_ALL} Value: {Fore.YELLOW}{display_value}{Style.RESET_ALL}")
         
-        print(f"{color}│{Style.RESET_ALL}")
-        print(f"{color}│{Style.RESET_ALL} Entropy: {secret.entropy:.2f}")
-        print(f"{color}│{Style.RESET_ALL} AI Confidence: {secret.ai_confidence:.0f}%")
+        template = _SECRET_TEMPLATES.get(secret.severity, _DEFAULT_SECRET_TEMPLATE)
+        parts = [template.format(
+            index=index,
+            severity=secret.severity,
+            type=secret.type,
+            status=status,
+            location=secret.location,
+            line_number=secret.line_number,
+            value=display_value,
+            entropy=secret.entropy,
+            ai_confidence=secret.ai_confidence
+        )]
         
         if secret.ai_reasoning:
-            print(f"{color}│{Style.RESET_ALL} AI Reasoning: {secret.ai_reasoning[:80]}")
+            parts.append(f"{bar} AI Reasoning: {secret.ai_reasoning[:80]}")
         
         if secret.api_valid is not None:
-            api_status = f"{Fore.GREEN}✓ Valid" if secret.api_valid else f"{Fore.RED}✗ Invalid"
-            print(f"{color}│{Style.RESET_ALL} API Validation: {api_status}{Style.RESET_ALL}")
+            api_status = _API_VALID if secret.api_valid else _API_INVALID
+            parts.append(f"{bar} API Validation: {api_status}{Style.RESET_ALL}")
             
             if secret.api_details:
-                print(f"{color}│{Style.RESET_ALL} API Details: {secret.api_details}")
+                parts.append(f"{bar} API Details: {secret.api_details}")
         
         if self.verbose and secret.context:
-            print(f"{color}│{Style.RESET_ALL}")
-            print(f"{color}│{Style.RESET_ALL} Context:")
-            context_lines = secret.context.split('\n')[:5]
+            parts.append(bar)
+            parts.append(f"{bar} Context:")
+            context_lines = secret.get_context().split('\n')[:5]
             for line in context_lines:
-                print(f"{color}│{Style.RESET_ALL}   {Fore.WHITE}{line[:70]}{Style.RESET_ALL}")
+                parts.append(f"{bar}   {Fore.WHITE}{line[:70]}{Style.RESET_ALL}")
         
-        print(f"{color}└{'─'*68}{Style.RESET_ALL}\n")
+        parts.append(f"{color}└{'─'*68}{Style.RESET_ALL}\n")
+        return parts
     
     def print_summary_table(self, finding: Finding):
         """Print summary table"""
         if not finding.secrets:
             return
         
-        table_data = []
+        # Columns are at least two wider than their header, as tabulate's grid had
+        rows = []
+        widths = [len(header) + 2 for header in _SUMMARY_HEADERS]
         for secret in finding.secrets:
-            table_data.append([
+            row = (
                 secret.type,
                 secret.severity,
                 secret.status,
                 f"{secret.ai_confidence:.0f}%",
                 "✓" if secret.api_valid else ("✗" if secret.api_valid is False else "-"),
                 secret.location[:40] + '...' if len(secret.location) > 40 else secret.location
-            ])
-        
-        headers = ["Type", "Severity", "Status", "AI Conf", "API", "Location"]
-        print(f"\n{Fore.CYAN}Summary Table:{Style.RESET_ALL}\n")
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            )
+            rows.append(row)
+            
+            # Track column widths while collecting rows
+            for i, cell in enumerate(row):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+        
+        # Grid borders, computed once from the column widths
+        rule = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+        header_rule = rule.replace('-', '=')
+        
+        lines = [
+            f"\n{Fore.CYAN}Summary Table:{Style.RESET_ALL}\n",
+            rule,
+            self._table_row(_SUMMARY_HEADERS, widths),
+            header_rule
+        ]
+        for row in rows:
+            lines.append(self._table_row(row, widths))
+            lines.append(rule)
+        _write(lines)
+    
+    @staticmethod
+    def _table_row(cells, widths: List[int]) -> str:
+        """Format one grid table row with cells padded to the column widths"""
+        return '| ' + ' | '.join(cell.ljust(width) for cell, width in zip(cells, widths)) + ' |'
@@ -1,9 +1,22 @@
 """JSON export functionality"""
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 from models.secret import Finding
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data) -> bytes:
+    """Serialize to indented UTF-8 JSON, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 class JSONExporter:
     """Export findings to JSON"""
@@ -22,12 +35,19 @@ class JSONExporter:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Write to a sibling temp file and rename over the target, so an
+        # interrupted export never leaves a truncated report behind
+        tmp_file = output_file.with_suffix(output_file.suffix + '.tmp')
+        try:
+            tmp_file.write_bytes(_dumps(data))
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
         
         return str(output_file)
     
     def export_string(self, finding: Finding) -> str:
         """Export finding to JSON string"""
         data = finding.to_dict()
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dumps(data).decode('utf-8')
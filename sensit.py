@@ -3,19 +3,29 @@
 SenSIt - Sensitive Information Scanner & Validator
 Main CLI entry point
 """
-import asyncio
 import click
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.scanner import SecretsScanner
+# The scanner, reporters and their HTTP/AI stacks are imported inside main()
+# so --help and argument errors don't pay for them
 from core.config import Config
 from core.logger import logger, setup_logger
-from output.cli_reporter import CLIReporter
-from output.json_exporter import JSONExporter
+
+if TYPE_CHECKING:
+    from core.scanner import SecretsScanner
+
+
+async def run_scan(scanner: "SecretsScanner", scan):
+    """Await a scan, then close the scanner's shared HTTP sessions"""
+    try:
+        return await scan
+    finally:
+        await scanner.aclose()
 
 
 @click.command()
@@ -64,13 +74,19 @@ def main(url, file_path, dir_path, output, config, no_ai, no_api, ai_provider, v
         cfg.set('validation.enable_api_validation', False)
     if ai_provider:
         cfg.set('ai_provider', ai_provider.lower())
+    if quiet:
+        cfg.set('quiet', True)
     
-    # Initialize scanner
-    scanner = SecretsScanner(cfg)
+    # Initialize reporters (the CLI reporter only when printing)
+    if json_only:
+        cli_reporter = None
+    else:
+        from output.cli_reporter import CLIReporter
+        cli_reporter = CLIReporter(verbose=verbose)
     
-    # Initialize reporters
-    cli_reporter = CLIReporter(verbose=verbose)
-    json_exporter = JSONExporter()
+    if json_only or output:
+        from output.json_exporter import JSONExporter
+        json_exporter = JSONExporter()
     
     # Print banner
     if not quiet and not json_only:
@@ -82,32 +98,42 @@ def main(url, file_path, dir_path, output, config, no_ai, no_api, ai_provider, v
         click.echo("Run 'sensit.py --help' for usage information", err=True)
         sys.exit(1)
     
+    # Initialize scanner
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from core.scanner import SecretsScanner
+    scanner = SecretsScanner(cfg)
+    
     # Run scan
     try:
         if url:
-            finding = asyncio.run(scanner.scan_url(url))
+            finding = asyncio.run(run_scan(scanner, scanner.scan_url(url)))
         elif file_path:
-            finding = asyncio.run(scanner.scan_file(file_path))
+            finding = asyncio.run(run_scan(scanner, scanner.scan_file(file_path)))
         elif dir_path:
-            finding = asyncio.run(scanner.scan_directory(dir_path))
+            finding = asyncio.run(run_scan(scanner, scanner.scan_directory(dir_path)))
         
-        # Output results
-        if json_only:
-            # JSON output only
-            print(json_exporter.export_string(finding))
-        else:
-            # CLI output
-            if not quiet:
-                cli_reporter.print_finding(finding)
-                
-                if finding.secrets and verbose:
-                    cli_reporter.print_summary_table(finding)
-        
-        # Export to file if specified
-        if output:
-            output_file = json_exporter.export(finding, output)
-            if not quiet:
-                logger.info(f"Report exported to: {output_file}")
+        # Export to file in the background while results are printed
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            export_future = executor.submit(json_exporter.export, finding, output) if output else None
+            
+            # Output results
+            if json_only:
+                # JSON output only
+                print(json_exporter.export_string(finding))
+            else:
+                # CLI output
+                if not quiet:
+                    cli_reporter.print_finding(finding)
+                    
+                    if finding.secrets and verbose:
+                        cli_reporter.print_summary_table(finding)
+            
+            # Wait for the exported file
+            if export_future:
+                output_file = export_future.result()
+                if not quiet:
+                    logger.info(f"Report exported to: {output_file}")
         
         # Exit code based on findings
         if finding.get_confirmed_secrets():
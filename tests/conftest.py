@@ -0,0 +1,6 @@
+"""Shared pytest setup"""
+import sys
+from pathlib import Path
+
+# Import the scanner's packages from the repository root, as sensit.py does
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,61 @@
+"""Tests for the persistent AI result cache"""
+from models.secret import Secret
+from validation import ai_cache
+from validation.ai_cache import AICache
+
+
+def _secret(value: str = 'sk_live_abc', context: str = 'key = "sk_live_abc"') -> Secret:
+    return Secret(type='stripe_secret_key', value=value, location='a.py', context=context)
+
+
+def test_key_depends_on_model_secret_and_context():
+    key = AICache.key('openai:gpt-4', _secret())
+    
+    assert key == AICache.key('openai:gpt-4', _secret())
+    assert key != AICache.key('ollama:llama2', _secret())
+    assert key != AICache.key('openai:gpt-4', _secret(value='sk_live_xyz'))
+    assert key != AICache.key('openai:gpt-4', _secret(context='other line'))
+    
+    # Raw values never appear in the key
+    assert 'sk_live_abc' not in key
+
+
+def test_results_persist_across_reopen(tmp_path):
+    path = str(tmp_path / 'ai_cache.sqlite')
+    cache = AICache(path, ttl=60)
+    cache.put_many({'a': {'confidence': 90, 'reasoning': 'live key'}})
+    cache.close()
+    
+    cache = AICache(path, ttl=60)
+    assert cache.get_many(['a', 'missing']) == {'a': {'confidence': 90, 'reasoning': 'live key'}}
+    cache.close()
+
+
+def test_lookup_of_more_keys_than_one_query_holds(tmp_path):
+    cache = AICache(str(tmp_path / 'ai_cache.sqlite'), ttl=60)
+    results = {f'k{i}': {'confidence': i} for i in range(1200)}
+    cache.put_many(results)
+    
+    assert cache.get_many(list(results) + ['missing']) == results
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / 'ai_cache.sqlite')
+    now = [1000.0]
+    monkeypatch.setattr(ai_cache.time, 'time', lambda: now[0])
+    
+    cache = AICache(path, ttl=60)
+    cache.put_many({'a': {'confidence': 1}})
+    
+    now[0] += 59
+    assert cache.get_many(['a']) == {'a': {'confidence': 1}}
+    
+    now[0] += 2
+    assert cache.get_many(['a']) == {}
+    cache.close()
+    
+    # Expired rows are dropped when the cache is opened again
+    cache = AICache(path, ttl=60)
+    assert cache._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    cache.close()
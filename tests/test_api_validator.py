@@ -0,0 +1,141 @@
+"""Tests for live API validation"""
+import asyncio
+import json
+import httpx
+from core.config import Config
+from models.secret import Secret
+from validation import api_validator
+from validation.api_validator import APIValidator
+
+_TOKEN = 'github-token-under-test'
+
+
+def _secret(type_: str, location: str, line_number: int, value: str = 'v') -> Secret:
+    return Secret(type=type_, value=value, location=location, line_number=line_number)
+
+
+def test_pair_credentials_pairs_nearest_half_in_same_file():
+    access = _secret('aws_access_key', 'a.py', 10)
+    near = _secret('aws_secret_key', 'a.py', 12)
+    far = _secret('aws_secret_key', 'a.py', 25)
+    other_file = _secret('aws_secret_key', 'b.py', 10)
+    
+    pairs = APIValidator._pair_credentials([far, access, other_file, near])
+    
+    assert pairs == [(access, near)]
+
+
+def test_pair_credentials_uses_each_half_once():
+    first = _secret('aws_access_key', 'a.py', 10)
+    second = _secret('aws_access_key', 'a.py', 11)
+    key_a = _secret('aws_secret_key', 'a.py', 12)
+    key_b = _secret('aws_secret_key', 'a.py', 30)
+    
+    pairs = APIValidator._pair_credentials([first, second, key_a, key_b])
+    
+    assert pairs == [(first, key_a), (second, key_b)]
+
+
+def test_pair_credentials_ignores_halves_too_far_apart():
+    sid = _secret('twilio_account_sid', 'app.js', 1)
+    token = _secret('twilio_auth_token', 'app.js', 22)
+    
+    assert APIValidator._pair_credentials([sid, token]) == []
+    
+    token.line_number = 21
+    assert APIValidator._pair_credentials([sid, token]) == [(sid, token)]
+
+
+def test_pair_credentials_does_not_mix_providers():
+    access = _secret('aws_access_key', 'a.py', 1)
+    token = _secret('twilio_auth_token', 'a.py', 2)
+    stripe = _secret('stripe_secret_key', 'a.py', 3)
+    
+    assert APIValidator._pair_credentials([access, token, stripe]) == []
+
+
+class _FakeGitHub:
+    """GitHub /user endpoint that answers If-None-Match with 304 while the token is valid"""
+    
+    def __init__(self):
+        self.valid = True
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if not self.valid:
+            return httpx.Response(401)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={'login': 'octocat', 'id': 1},
+                              headers={'ETag': '"v1"', 'X-OAuth-Scopes': 'repo'})
+
+
+def _validate_github(config: Config, github: _FakeGitHub, monkeypatch) -> Secret:
+    """Validate a GitHub token with a fresh validator against the fake endpoint"""
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(github))
+        monkeypatch.setattr(api_validator, '_get_http_client', lambda: client)
+        validator = APIValidator(config)
+        try:
+            return await validator.validate_secret(Secret('github_token', _TOKEN, 'a.py', 1))
+        finally:
+            await validator.aclose()
+            await client.aclose()
+    
+    return asyncio.run(run())
+
+
+def _config(tmp_path) -> Config:
+    config = Config()
+    config.set('performance.enable_cache', True)
+    config.set('performance.cache_dir', str(tmp_path))
+    return config
+
+
+def test_github_revalidation_uses_etag(tmp_path, monkeypatch):
+    config = _config(tmp_path)
+    github = _FakeGitHub()
+    
+    first = _validate_github(config, github, monkeypatch)
+    second = _validate_github(config, github, monkeypatch)
+    
+    assert 'If-None-Match' not in github.requests[0].headers
+    assert github.requests[1].headers['If-None-Match'] == '"v1"'
+    assert first.api_valid and second.api_valid
+    assert second.api_details == first.api_details == {
+        'valid': True, 'username': 'octocat', 'user_id': 1, 'scopes': 'repo'
+    }
+    
+    # The cache is keyed by a hash, never the token itself
+    saved = (tmp_path / 'github_etag.json').read_text()
+    assert _TOKEN not in saved
+
+
+def test_github_revoked_token_is_forgotten(tmp_path, monkeypatch):
+    config = _config(tmp_path)
+    github = _FakeGitHub()
+    _validate_github(config, github, monkeypatch)
+    
+    github.valid = False
+    revoked = _validate_github(config, github, monkeypatch)
+    
+    assert revoked.api_valid is False
+    assert json.loads((tmp_path / 'github_etag.json').read_text()) == {}
+    
+    # With the entry gone, the next check asks for the full response again
+    github.valid = True
+    _validate_github(config, github, monkeypatch)
+    assert 'If-None-Match' not in github.requests[-1].headers
+
+
+def test_github_etag_cache_off_when_caching_disabled(tmp_path, monkeypatch):
+    config = _config(tmp_path)
+    config.set('performance.enable_cache', False)
+    github = _FakeGitHub()
+    
+    _validate_github(config, github, monkeypatch)
+    _validate_github(config, github, monkeypatch)
+    
+    assert all('If-None-Match' not in request.headers for request in github.requests)
+    assert not (tmp_path / 'github_etag.json').exists()
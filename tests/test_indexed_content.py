@@ -0,0 +1,104 @@
+"""Tests for indexed content and large-file windows"""
+from extraction.indexed_content import IndexedContent, decode_text, is_binary, iter_windows
+from extraction.pattern_matcher import PatternMatcher
+
+
+def test_line_number_of_offsets():
+    content = IndexedContent('one\ntwo\n\nfour')
+    
+    assert content.line_number(0) == 1
+    assert content.line_number(3) == 1
+    assert content.line_number(4) == 2
+    assert content.line_number(8) == 3
+    assert content.line_number(9) == 4
+    assert content.line_number(12) == 4
+
+
+def test_context_ref_spans_lines_around_a_line():
+    text = '\n'.join(f'line {n}' for n in range(1, 11))
+    content = IndexedContent(text)
+    
+    assert content.context_ref(5, 1).render() == 'line 4\nline 5\nline 6'
+    assert content.context_ref(1, 2).render() == 'line 1\nline 2\nline 3'
+    assert content.context_ref(10, 2).render() == 'line 8\nline 9\nline 10'
+    assert content.context_ref(5, 0).render() == 'line 5'
+
+
+def test_line_offset_shifts_line_numbers_and_context():
+    content = IndexedContent('a\nb\nc', line_offset=10)
+    
+    assert content.line_number(2) == 12
+    assert content.context_ref(12, 0).render() == 'b'
+
+
+def test_owns_only_its_own_range():
+    content = IndexedContent('lead\nown\ntail', start=5, end=9)
+    
+    assert not content.owns(4)
+    assert content.owns(5)
+    assert content.owns(8)
+    assert not content.owns(9)
+    assert IndexedContent('whole').owns(4)
+
+
+def test_decode_text_normalizes_newlines_and_drops_bad_bytes():
+    assert decode_text(b'a\r\nb\rc\xff\n') == 'a\nb\nc\n'
+
+
+def test_is_binary():
+    assert not is_binary(b'')
+    assert not is_binary(b'key = "value"\n\tindented\r\n')
+    assert is_binary(b'text\0more')
+    assert is_binary(bytes(range(1, 9)) * 4 + b'abc')
+
+
+def _lines(count: int, width: int = 40) -> bytes:
+    return b''.join(b'%05d ' % i + b'x' * width + b'\n' for i in range(count))
+
+
+def test_windows_own_every_byte_once():
+    buffer = _lines(500)
+    windows = list(iter_windows(buffer, 1000, 64, context_lines=5))
+    
+    assert len(windows) > 1
+    assert ''.join(w.text[w.start:w.end] for w in windows) == buffer.decode()
+
+
+def test_window_line_numbers_match_whole_text():
+    buffer = _lines(500)
+    
+    for window in iter_windows(buffer, 1000, 64, context_lines=5):
+        own = window.text[window.start:window.end]
+        first_line = int(own[:5]) + 1
+        assert window.line_number(window.start) == first_line
+
+
+def test_window_carries_context_lines_beyond_overlap():
+    buffer = _lines(500, width=200)
+    
+    for window in iter_windows(buffer, 4000, 16, context_lines=5):
+        whole = IndexedContent(buffer.decode())
+        for offset in (window.start, window.end - 1):
+            line = window.line_number(offset)
+            assert window.context_ref(line, 5).render() == whole.context_ref(line, 5).render()
+
+
+def test_match_on_window_boundary_keeps_keywords_from_previous_window():
+    # firebase_api_key needs a keyword that sits three long lines above the key,
+    # farther back than the byte overlap
+    head = 'const firebaseConfig = {\n' + ('  // ' + 'y' * 120 + '\n') * 3
+    key_line = '  apiKey: "AIza' + 'A1b2C3d4E5' * 3 + 'xyzAB",\n'
+    buffer = (head + key_line + ('z' * 50 + '\n') * 20).encode()
+    matcher = PatternMatcher()
+    
+    windows = list(iter_windows(buffer, len(head), 16, context_lines=5))
+    assert windows[1].text[windows[1].start:].startswith('  apiKey')
+    
+    def firebase(secrets):
+        return [(s.line_number, s.value, s.get_context()) for s in secrets if s.type == 'firebase_api_key']
+    
+    windowed = firebase(s for window in windows for s in matcher.find_matches(window, 'config.js'))
+    whole = firebase(matcher.find_matches(buffer.decode(), 'config.js'))
+    
+    assert len(whole) == 1
+    assert windowed == whole
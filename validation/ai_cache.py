@@ -0,0 +1,70 @@
+"""Persistent cache of AI validation results"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable
+from models.secret import Secret
+
+
+# Keys per lookup query, below SQLite's bound parameter limit
+_QUERY_CHUNK = 500
+
+
+class AICache:
+    """SQLite-backed exact-match cache of AI results, expiring after a TTL"""
+    
+    def __init__(self, path: str, ttl: int):
+        self.ttl = ttl
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        
+        # Drop expired entries
+        self._db.execute("DELETE FROM results WHERE created <= ?", (time.time() - self.ttl,))
+        self._db.commit()
+    
+    @staticmethod
+    def key(namespace: str, secret: Secret) -> str:
+        """Hash a secret and the model judging it into a cache key (raw values are never stored)"""
+        data = f"{namespace}|{secret.type}|{secret.value}|{secret.get_context()[:500]}"
+        return hashlib.blake2b(data.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        """Look up cached results, returning the unexpired hits by key"""
+        keys = list(keys)
+        cutoff = time.time() - self.ttl
+        hits = {}
+        
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, result FROM results WHERE created > ? AND key IN ({placeholders})",
+                (cutoff, *chunk)
+            )
+            for key, result in rows:
+                hits[key] = json.loads(result)
+        
+        return hits
+    
+    def put_many(self, results: Dict[str, dict]):
+        """Store results by key"""
+        if not results:
+            return
+        
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO results (key, result, created) VALUES (?, ?, ?)",
+            [(key, json.dumps(result), now) for key, result in results.items()]
+        )
+        self._db.commit()
+    
+    def close(self):
+        """Close the database"""
+        self._db.close()
@@ -1,10 +1,122 @@
 """AI-powered validation using multiple providers (OpenAI, Gemini, Ollama)"""
+import asyncio
+import bisect
 import json
-from typing import List, Optional
+import os
+import re
+import sqlite3
+import sys
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import httpx
+from aiolimiter import AsyncLimiter
+from tenacity import AsyncRetrying, Retrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from tqdm import tqdm
 from models.secret import Secret
 from core.logger import logger
 from core.config import Config
+from validation.ai_cache import AICache
+
+
+# Decodes a JSON value embedded in surrounding text
+_JSON_DECODER = json.JSONDecoder()
+
+# Gemini's client retries some errors on its own unless told not to; retries
+# are left to tenacity so they honour validation.max_retries and the rate limits
+_GEMINI_REQUEST_OPTIONS = {'retry': None}
+
+# AI confidence thresholds and the status each band maps to
+_STATUS_BINS = (30, 60, 85)
+_STATUS_NAMES = ('UNVERIFIED', 'POSSIBLE', 'LIKELY', 'CONFIRMED')
+
+# Values this predictable are false positives; they get a fixed result instead of an AI call
+# ("test" is deliberately not a marker: real Stripe test-mode keys start with sk_test_)
+_PLACEHOLDER_RE = re.compile(r'(?i)(example|placeholder|dummy|xxxx+|your[_-]?key|<.*>)')
+_PLACEHOLDER_MAX_ENTROPY = 2.0
+_PLACEHOLDER_RESULT = {'confidence': 5, 'reasoning': 'Low entropy or placeholder value, not sent for AI analysis'}
+
+# Prompts start with static instructions so providers can reuse their cached
+# prefix across calls; the secrets being analyzed always come last
+_SYSTEM_PROMPT = "You are a security expert analyzing potential secrets. Respond only with valid JSON."
+_BATCH_SYSTEM_PROMPT = "You are a security expert analyzing potential secrets. Respond only with valid JSON array."
+
+_PROMPT_INSTRUCTIONS = """Analyze the potential secret below and determine if it's a real credential or a false positive.
+
+Determine:
+1. Is this a real secret or a test/example/placeholder?
+2. Confidence level (0-100)
+3. Brief reasoning
+
+IMPORTANT: Respond ONLY with valid JSON in this exact format:
+{
+    "is_valid": true,
+    "confidence": 85,
+    "reasoning": "brief explanation"
+}
+
+Do not include any other text, only the JSON object.
+"""
+
+_BATCH_PROMPT_INSTRUCTIONS = """Analyze the potential secrets below and determine which are real credentials vs false positives.
+
+For each secret, determine:
+1. Is it a real secret or test/example/placeholder?
+2. Confidence level (0-100)
+3. Brief reasoning
+
+IMPORTANT: Respond ONLY with valid JSON in this exact format:
+{
+    "secrets": [
+        {
+            "id": 0,
+            "is_valid": true,
+            "confidence": 85,
+            "reasoning": "brief explanation"
+        }
+    ]
+}
+
+Do not include any other text, only the JSON object.
+"""
+
+
+class _JSONObjectTracker:
+    """Follows streamed JSON text to tell when its top-level object is complete"""
+    
+    __slots__ = ('depth', 'in_string', 'escaped')
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk; True once the object has closed"""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif self.depth == 0:
+                # Anything but whitespace before the object means the output has drifted
+                if char == '{':
+                    self.depth = 1
+                elif not char.isspace():
+                    raise ValueError(f"Response is not a JSON object (starts with {char!r})")
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        
+        return False
 
 
 class AIValidator:
@@ -13,6 +125,19 @@ class AIValidator:
     def __init__(self, config: Config):
         self.config = config
         self.provider = config.get('ai_provider', 'openai').lower()
+        self.async_client = None
+        self.use_batch_api = False
+        self._rpm: Optional[int] = None
+        self._tpm: Optional[int] = None
+        
+        # (rpm, tpm) limiters, one pair per event loop since validate_batch runs
+        # each call in a fresh loop
+        self._limiters: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]' = \
+            weakref.WeakKeyDictionary()
+        
+        # Provider errors worth retrying (timeouts, dropped connections, 429s, 5xx)
+        self.max_retries = config.get('validation.max_retries', 3)
+        self._retryable: tuple = (httpx.TransportError,)
         
         # Initialize the appropriate provider
         if self.provider == 'openai':
@@ -27,11 +152,46 @@ class AIValidator:
         
         if not self.client:
             logger.warning(f"AI validation disabled. Provider: {self.provider}")
+        
+        # Result cache, opened on first validation so a disabled or unused AI step never touches disk
+        self._cache: Optional[AICache] = None
+        self._cache_opened = False
+    
+    def _get_cache(self) -> Optional[AICache]:
+        """Get the result cache, opening it on first use (None when caching is off)"""
+        if not self._cache_opened:
+            self._cache = self._open_cache()
+            self._cache_opened = True
+        return self._cache
+    
+    def _open_cache(self) -> Optional[AICache]:
+        """Open the persistent result cache if enabled in performance settings"""
+        if not self.config.get('performance.enable_cache', True):
+            return None
+        
+        cache_dir = Path(self.config.get('performance.cache_dir', '~/.sensit')).expanduser()
+        try:
+            return AICache(str(cache_dir / 'ai_cache.sqlite'), self.config.get('performance.cache_ttl', 86400))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"AI result cache disabled: {e}")
+            return None
+    
+    def close(self):
+        """Close the result cache"""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        self._cache_opened = False
+    
+    def _cache_key(self, secret: Secret) -> str:
+        """Cache key of a secret for the configured provider and model"""
+        return AICache.key(f"{self.provider}:{self.model}", secret)
     
     def _init_openai(self):
         """Initialize OpenAI client"""
         try:
-            from openai import OpenAI
+            import openai
+            from openai import AsyncOpenAI, OpenAI
             api_key = self.config.get('openai.api_key')
             if not api_key:
                 logger.warning("OpenAI API key not configured")
@@ -41,9 +201,16 @@ class AIValidator:
             self.max_tokens = self.config.get('openai.max_tokens', 500)
             self.temperature = self.config.get('openai.temperature', 0.3)
             self.batch_size = self.config.get('openai.batch_size', 10)
+            self.max_concurrency = self.config.get('openai.max_concurrency', 10)
+            self.use_batch_api = self.config.get('openai.use_batch_api', False)
+            self.batch_poll_interval = self.config.get('openai.batch_poll_interval', 30)
+            self._init_rate_limits('openai')
+            self._retryable = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
             
+            # Retries are ours (see _with_retries), so they go through the rate limiter
             logger.info(f"Initialized OpenAI with model: {self.model}")
-            return OpenAI(api_key=api_key)
+            self.async_client = AsyncOpenAI(api_key=api_key, max_retries=0)
+            return OpenAI(api_key=api_key, max_retries=0)
         except ImportError:
             logger.error("OpenAI library not installed. Run: pip install openai")
             return None
@@ -55,6 +222,7 @@ class AIValidator:
         """Initialize Google Gemini client"""
         try:
             import google.generativeai as genai
+            from google.api_core import exceptions as google_exceptions
             api_key = self.config.get('gemini.api_key')
             if not api_key:
                 logger.warning("Gemini API key not configured")
@@ -64,6 +232,14 @@ class AIValidator:
             self.max_tokens = self.config.get('gemini.max_tokens', 500)
             self.temperature = self.config.get('gemini.temperature', 0.3)
             self.batch_size = self.config.get('gemini.batch_size', 10)
+            self.max_concurrency = self.config.get('gemini.max_concurrency', 10)
+            self._init_rate_limits('gemini')
+            self._retryable = (
+                google_exceptions.ResourceExhausted,
+                google_exceptions.ServiceUnavailable,
+                google_exceptions.InternalServerError,
+                google_exceptions.DeadlineExceeded,
+            )
             
             genai.configure(api_key=api_key)
             logger.info(f"Initialized Gemini with model: {self.model}")
@@ -75,6 +251,61 @@ class AIValidator:
             logger.error(f"Error initializing Gemini: {e}")
             return None
     
+    def _init_rate_limits(self, provider: str):
+        """Read the per-minute request and token budgets from the provider's rpm/tpm settings"""
+        self._rpm = self.config.get(f'{provider}.rpm')
+        self._tpm = self.config.get(f'{provider}.tpm')
+    
+    def _get_limiters(self) -> Tuple[Optional[AsyncLimiter], Optional[AsyncLimiter]]:
+        """Get the running loop's (rpm, tpm) limiters, creating them on first use"""
+        loop = asyncio.get_running_loop()
+        limiters = self._limiters.get(loop)
+        if limiters is None:
+            # A limiter keeps its loop alive, so pairs for closed loops are dropped here
+            for closed in [other for other in self._limiters if other.is_closed()]:
+                del self._limiters[closed]
+            
+            limiters = self._limiters[loop] = (
+                AsyncLimiter(self._rpm, 60) if self._rpm else None,
+                AsyncLimiter(self._tpm, 60) if self._tpm else None
+            )
+        return limiters
+    
+    async def _throttle(self, prompt: str, max_tokens: int):
+        """Wait until a call fits the rate limits, rather than sending it into a 429"""
+        if not (self._rpm or self._tpm):
+            return
+        
+        rpm_limiter, tpm_limiter = self._get_limiters()
+        if rpm_limiter:
+            await rpm_limiter.acquire()
+        
+        # Providers count the prompt (about 4 characters per token) plus the requested output
+        if tpm_limiter:
+            tokens = len(prompt) // 4 + max_tokens
+            await tpm_limiter.acquire(min(tokens, tpm_limiter.max_rate))
+    
+    def _retry_policy(self) -> dict:
+        """Tenacity settings: retry transient errors with random exponential backoff"""
+        return {
+            'retry': retry_if_exception_type(self._retryable),
+            'wait': wait_random_exponential(multiplier=1, max=30),
+            'stop': stop_after_attempt(self.max_retries + 1),
+            'reraise': True
+        }
+    
+    async def _with_retries(self, call):
+        """Await a provider call, retrying transient errors (the only retry layer; SDK retries are off)"""
+        async for attempt in AsyncRetrying(**self._retry_policy()):
+            with attempt:
+                return await call()
+    
+    def _with_retries_sync(self, call):
+        """Make a blocking provider call, retrying transient errors like _with_retries"""
+        for attempt in Retrying(**self._retry_policy()):
+            with attempt:
+                return call()
+    
     def _init_ollama(self):
         """Initialize Ollama client (local)"""
         try:
@@ -84,12 +315,20 @@ class AIValidator:
             self.max_tokens = self.config.get('ollama.max_tokens', 500)
             self.temperature = self.config.get('ollama.temperature', 0.3)
             self.batch_size = self.config.get('ollama.batch_size', 5)
+            self.num_ctx = self.config.get('ollama.num_ctx', 8192)
+            self.keep_alive = self.config.get('ollama.keep_alive', '30m')
+            
+            # Match the server's parallel request slots unless configured
+            self.max_concurrency = (self.config.get('ollama.max_concurrency')
+                                    or int(os.environ.get('OLLAMA_NUM_PARALLEL', 4)))
             
             # Test connection
             try:
-                ollama.list()
+                client = ollama.Client(host=self.base_url)
+                client.list()
+                self.async_client = ollama.AsyncClient(host=self.base_url)
                 logger.info(f"Initialized Ollama with model: {self.model}")
-                return ollama
+                return client
             except:
                 logger.warning(f"Ollama not running at {self.base_url}. Start with: ollama serve")
                 return None
@@ -105,6 +344,18 @@ class AIValidator:
         if not self.client:
             return secret
         
+        if self._is_placeholder(secret):
+            self._apply_result(secret, _PLACEHOLDER_RESULT)
+            return secret
+        
+        # Reuse a cached result for the same secret and model
+        key = self._cache_key(secret)
+        cache = self._get_cache()
+        cached = cache.get_many([key]).get(key) if cache else None
+        if cached:
+            self._apply_result(secret, cached)
+            return secret
+        
         try:
             prompt = self._create_prompt(secret)
             
@@ -120,18 +371,9 @@ class AIValidator:
             
             if result:
                 # Update secret with AI analysis
-                secret.ai_confidence = result.get('confidence', 0)
-                secret.ai_reasoning = result.get('reasoning', '')
-                
-                # Adjust severity based on AI confidence
-                if secret.ai_confidence < 30:
-                    secret.status = "UNVERIFIED"
-                elif secret.ai_confidence < 60:
-                    secret.status = "POSSIBLE"
-                elif secret.ai_confidence < 85:
-                    secret.status = "LIKELY"
-                else:
-                    secret.status = "CONFIRMED"
+                self._apply_result(secret, result)
+                if cache:
+                    cache.put_many({key: result})
                 
                 logger.debug(f"AI validation for {secret.type}: {secret.ai_confidence}% confidence")
             
@@ -141,76 +383,186 @@ class AIValidator:
         return secret
     
     def validate_batch(self, secrets: List[Secret]) -> List[Secret]:
-        """Validate multiple secrets in batches"""
+        """Validate multiple secrets in batches (blocking wrapper around avalidate_batch)"""
+        return asyncio.run(self.avalidate_batch(secrets))
+    
+    async def avalidate_batch(self, secrets: List[Secret]) -> List[Secret]:
+        """Validate multiple secrets in batches, sending up to max_concurrency batches at once"""
         if not self.client:
             return secrets
         
-        validated = []
-        total_batches = (len(secrets) + self.batch_size - 1) // self.batch_size
+        # Settle obvious placeholders without the AI, and group identical secrets so
+        # each is sent at most once. The group keys are the cache keys, hashed once
+        # here and reused for the lookup, the batches and storing results
+        groups: Dict[str, List[Secret]] = {}
+        skipped = 0
+        for secret in secrets:
+            if self._is_placeholder(secret):
+                self._apply_result(secret, _PLACEHOLDER_RESULT)
+                skipped += 1
+            else:
+                groups.setdefault(self._cache_key(secret), []).append(secret)
+        
+        if skipped:
+            logger.info(f"AI validation: {skipped} low-entropy or placeholder secrets skipped")
+        
+        # Resolve cached ones now
+        cache = self._get_cache() if groups else None
+        cached = cache.get_many(groups) if cache else {}
+        for key, result in cached.items():
+            for secret in groups.pop(key):
+                self._apply_result(secret, result)
         
-        # Create progress bar
-        with tqdm(total=len(secrets), desc=f"AI Validation ({self.provider})", 
-                  unit="secret", ncols=80, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}') as pbar:
+        if cached:
+            logger.info(f"AI validation: {len(cached)} results reused from cache")
+        
+        # Pull the prompt fields out of each unique secret once, then slice batches from them
+        keys = list(groups)
+        packed = [self._pack_for_prompt(groups[key][0]) for key in keys]
+        batches = [
+            (keys[i:i + self.batch_size], packed[i:i + self.batch_size])
+            for i in range(0, len(keys), self.batch_size)
+        ]
+        
+        if self.use_batch_api and batches:
+            await self._validate_with_batch_api(groups, batches)
+        else:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
             
-            # Process in batches
-            for i in range(0, len(secrets), self.batch_size):
-                batch = secrets[i:i + self.batch_size]
+            # Create progress bar, redrawn at most twice a second and hidden when not on a terminal
+            with tqdm(total=len(secrets), initial=len(secrets) - sum(map(len, groups.values())),
+                      desc=f"AI Validation ({self.provider})", 
+                      unit="secret", ncols=80, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}',
+                      mininterval=0.5, miniters=max(1, len(secrets) // 200),
+                      disable=not sys.stderr.isatty() or self.config.get('quiet', False)) as pbar:
                 
-                try:
-                    # Create batch prompt
-                    prompt = self._create_batch_prompt(batch)
-                    
-                    # Call appropriate provider
-                    if self.provider == 'openai':
-                        result = self._call_openai_batch(prompt, len(batch))
-                    elif self.provider == 'gemini':
-                        result = self._call_gemini_batch(prompt)
-                    elif self.provider == 'ollama':
-                        result = self._call_ollama_batch(prompt)
-                    else:
-                        validated.extend(batch)
-                        pbar.update(len(batch))
-                        continue
-                    
-                    if result:
-                        results = result.get('secrets', [])
-                        
-                        # Update secrets with AI analysis
-                        for j, secret in enumerate(batch):
-                            if j < len(results):
-                                ai_result = results[j]
-                                secret.ai_confidence = ai_result.get('confidence', 0)
-                                secret.ai_reasoning = ai_result.get('reasoning', '')
-                                
-                                # Update status
-                                if secret.ai_confidence < 30:
-                                    secret.status = "UNVERIFIED"
-                                elif secret.ai_confidence < 60:
-                                    secret.status = "POSSIBLE"
-                                elif secret.ai_confidence < 85:
-                                    secret.status = "LIKELY"
-                                else:
-                                    secret.status = "CONFIRMED"
-                            
-                            validated.append(secret)
-                    else:
-                        validated.extend(batch)
+                async def process(batch_keys: List[str], batch_packed: List[tuple]):
+                    async with semaphore:
+                        results = await self._validate_batch_chunk(batch_packed)
                     
-                    # Update progress bar
-                    pbar.update(len(batch))
-                    
-                except Exception as e:
-                    logger.error(f"Batch AI validation error: {e}")
-                    validated.extend(batch)
-                    pbar.update(len(batch))
+                    self._store_results(groups, batch_keys, results)
+                    pbar.update(sum(len(groups[key]) for key in batch_keys))
+                
+                await asyncio.gather(*(process(*batch) for batch in batches))
+        
+        logger.info(f"AI validation complete: {len(secrets)} secrets processed")
+        return secrets
+    
+    def _store_results(self, groups: Dict[str, List[Secret]], batch_keys: List[str], results: List[dict]):
+        """Apply a batch's AI results to every copy of its secrets and cache them"""
+        fresh = {}
+        try:
+            # Update every copy of each secret with AI analysis
+            for key, result in zip(batch_keys, results):
+                for secret in groups[key]:
+                    self._apply_result(secret, result)
+                fresh[key] = result
+        except Exception as e:
+            logger.error(f"Batch AI validation error: {e}")
         
-        logger.info(f"AI validation complete: {len(validated)} secrets processed")
-        return validated
+        cache = self._get_cache()
+        if cache:
+            cache.put_many(fresh)
+    
+    async def _validate_with_batch_api(self, groups: Dict[str, List[Secret]],
+                                       batches: List[Tuple[List[str], List[tuple]]]):
+        """
+        Validate batches through OpenAI's Batch API: one JSONL upload, then
+        poll until the job finishes. Costs half as much as live calls, but
+        results can take up to 24 hours.
+        """
+        lines = []
+        for n, (batch_keys, batch_packed) in enumerate(batches):
+            lines.append(json.dumps({
+                'custom_id': f'batch-{n}',
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._openai_batch_request(self._create_batch_prompt(batch_packed), len(batch_packed))
+            }))
+        
+        try:
+            input_file = await self.async_client.files.create(
+                file=('sensit_batch.jsonl', '\n'.join(lines).encode()),
+                purpose='batch'
+            )
+            job = await self.async_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint='/v1/chat/completions',
+                completion_window='24h'
+            )
+            logger.info(f"Submitted {len(batches)} batches to the OpenAI Batch API (job {job.id})")
+            
+            # Wait for the job to finish
+            while job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+                await asyncio.sleep(self.batch_poll_interval)
+                job = await self.async_client.batches.retrieve(job.id)
+            
+            if job.status != 'completed' or not job.output_file_id:
+                logger.error(f"OpenAI batch job {job.id} ended with status: {job.status}")
+                return
+            
+            output = await self.async_client.files.content(job.output_file_id)
+        except Exception as e:
+            logger.error(f"OpenAI Batch API error: {e}")
+            return
+        
+        # Match each response back to its batch by custom_id; a bad record only loses its batch
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            
+            try:
+                record = json.loads(line)
+                response = record.get('response') or {}
+                if response.get('status_code') != 200:
+                    logger.error(f"OpenAI batch request {record.get('custom_id')} failed: {record.get('error')}")
+                    continue
+                
+                result = self._extract_json(response['body']['choices'][0]['message']['content'])
+                if result:
+                    batch_keys = batches[int(record['custom_id'].split('-')[1])][0]
+                    self._store_results(groups, batch_keys, result.get('secrets', []))
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                logger.error(f"Skipping malformed OpenAI batch output line: {e!r}")
+    
+    async def _validate_batch_chunk(self, batch: List[tuple]) -> List[dict]:
+        """Validate one batch with a single provider call, returning results in batch order"""
+        try:
+            # Create batch prompt
+            prompt = self._create_batch_prompt(batch)
+            
+            # Call appropriate provider
+            if self.provider == 'openai':
+                result = await self._acall_openai_batch(prompt, len(batch))
+            elif self.provider == 'gemini':
+                result = await self._acall_gemini_batch(prompt)
+            elif self.provider == 'ollama':
+                result = await self._acall_ollama_batch(prompt)
+            else:
+                return []
+            
+            return result.get('secrets', []) if result else []
+            
+        except Exception as e:
+            logger.error(f"Batch AI validation error: {e}")
+            return []
+    
+    @staticmethod
+    def _is_placeholder(secret: Secret) -> bool:
+        """Check if a secret is too low-entropy or placeholder-like to be worth an AI call"""
+        return secret.entropy < _PLACEHOLDER_MAX_ENTROPY or _PLACEHOLDER_RE.search(secret.value) is not None
+    
+    def _apply_result(self, secret: Secret, result: dict):
+        """Update a secret with an AI result"""
+        secret.ai_confidence = result.get('confidence', 0)
+        secret.ai_reasoning = result.get('reasoning', '')
+        
+        # Adjust status based on AI confidence (a threshold itself belongs to the band above)
+        secret.status = _STATUS_NAMES[bisect.bisect_right(_STATUS_BINS, secret.ai_confidence)]
     
     def _create_prompt(self, secret: Secret) -> str:
         """Create validation prompt for a single secret"""
-        prompt = f"""Analyze this potential secret and determine if it's a real credential or a false positive.
-
+        prompt = _PROMPT_INSTRUCTIONS + f"""
 Secret Type: {secret.type}
 Value: {secret.value[:50]}...
 Entropy: {secret.entropy:.2f}
@@ -218,96 +570,89 @@ Location: {secret.location}
 
 Context (surrounding code):
 ```
-{secret.context[:500]}
+{secret.get_context()[:500]}
 ```
-
-Determine:
-1. Is this a real secret or a test/example/placeholder?
-2. Confidence level (0-100)
-3. Brief reasoning
-
-IMPORTANT: Respond ONLY with valid JSON in this exact format:
-{{
-    "is_valid": true,
-    "confidence": 85,
-    "reasoning": "brief explanation"
-}}
-
-Do not include any other text, only the JSON object.
 """
         return prompt
     
-    def _create_batch_prompt(self, secrets: List[Secret]) -> str:
-        """Create validation prompt for multiple secrets"""
-        secrets_data = []
-        
-        for i, secret in enumerate(secrets):
-            secrets_data.append({
-                'id': i,
-                'type': secret.type,
-                'value': secret.value[:50] + '...' if len(secret.value) > 50 else secret.value,
-                'entropy': round(secret.entropy, 2),
-                'context': secret.context[:200]
-            })
+    @staticmethod
+    def _pack_for_prompt(secret: Secret) -> tuple:
+        """Extract the (type, value, entropy, context) a batch prompt shows, truncated as sent"""
+        value = secret.value[:50] + '...' if len(secret.value) > 50 else secret.value
+        return (secret.type, value, round(secret.entropy, 2), secret.get_context()[:200])
+    
+    def _create_batch_prompt(self, packed: List[tuple]) -> str:
+        """Create validation prompt for multiple secrets from their packed prompt fields"""
+        secrets_data = [
+            {'id': i, 'type': type_, 'value': value, 'entropy': entropy, 'context': context}
+            for i, (type_, value, entropy, context) in enumerate(packed)
+        ]
         
-        prompt = f"""Analyze these {len(secrets)} potential secrets and determine which are real credentials vs false positives.
-
-Secrets to analyze:
-{json.dumps(secrets_data, indent=2)}
-
-For each secret, determine:
-1. Is it a real secret or test/example/placeholder?
-2. Confidence level (0-100)
-3. Brief reasoning
-
-IMPORTANT: Respond ONLY with valid JSON in this exact format:
-{{
-    "secrets": [
-        {{
-            "id": 0,
-            "is_valid": true,
-            "confidence": 85,
-            "reasoning": "brief explanation"
-        }}
-    ]
-}}
-
-Do not include any other text, only the JSON object.
+        prompt = _BATCH_PROMPT_INSTRUCTIONS + f"""
+Secrets to analyze ({len(packed)}):
+{json.dumps(secrets_data, separators=(',', ':'))}
 """
         return prompt
     
     def _call_openai(self, prompt: str) -> Optional[dict]:
         """Call OpenAI API"""
         try:
-            response = self.client.chat.completions.create(
+            response = self._with_retries_sync(lambda: self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a security expert analyzing potential secrets. Respond only with valid JSON."},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
                 response_format={"type": "json_object"}
-            )
+            ))
             return json.loads(response.choices[0].message.content)
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return None
     
-    def _call_openai_batch(self, prompt: str, batch_size: int) -> Optional[dict]:
-        """Call OpenAI API for batch"""
+    def _openai_batch_request(self, prompt: str, batch_size: int) -> dict:
+        """Build the chat completion parameters for a batch prompt"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": _BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': self.max_tokens * batch_size,
+            'temperature': self.temperature,
+            'response_format': {"type": "json_object"}
+        }
+    
+    async def _acall_openai_batch(self, prompt: str, batch_size: int) -> Optional[dict]:
+        """
+        Call OpenAI API for batch without blocking the event loop. The response
+        is streamed and the stream closed as soon as the JSON object is complete,
+        or as soon as the output stops looking like one.
+        """
+        params = self._openai_batch_request(prompt, batch_size)
+        
+        async def call():
+            await self._throttle(prompt, params['max_tokens'])
+            stream = await self.async_client.chat.completions.create(**params, stream=True)
+            
+            parts = []
+            tracker = _JSONObjectTracker()
+            try:
+                async for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text:
+                        parts.append(text)
+                        if tracker.feed(text):
+                            break
+            finally:
+                await stream.close()
+            return ''.join(parts)
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a security expert analyzing potential secrets. Respond only with valid JSON array."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens * batch_size,
-                temperature=self.temperature,
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
+            text = await self._with_retries(call)
+            return _JSON_DECODER.raw_decode(text.lstrip())[0]
         except Exception as e:
             logger.error(f"OpenAI batch API error: {e}")
             return None
@@ -315,42 +660,35 @@ Do not include any other text, only the JSON object.
     def _call_gemini(self, prompt: str) -> Optional[dict]:
         """Call Google Gemini API"""
         try:
-            response = self.client.generate_content(
+            response = self._with_retries_sync(lambda: self.client.generate_content(
                 prompt,
                 generation_config={
                     'temperature': self.temperature,
                     'max_output_tokens': self.max_tokens,
-                }
-            )
-            # Parse JSON from response
-            text = response.text
-            # Extract JSON from markdown code blocks if present
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0].strip()
-            return json.loads(text)
+                },
+                request_options=_GEMINI_REQUEST_OPTIONS
+            ))
+            return self._extract_json(response.text)
         except Exception as e:
             logger.error(f"Gemini API error: {e}")
             return None
     
-    def _call_gemini_batch(self, prompt: str) -> Optional[dict]:
-        """Call Google Gemini API for batch"""
-        try:
-            response = self.client.generate_content(
-                prompt,
-                generation_config={
-                    'temperature': self.temperature,
-                    'max_output_tokens': self.max_tokens * 2,
-                }
+    async def _acall_gemini_batch(self, prompt: str) -> Optional[dict]:
+        """Call Google Gemini API for batch without blocking the event loop"""
+        generation_config = {
+            'temperature': self.temperature,
+            'max_output_tokens': self.max_tokens * 2,
+        }
+        
+        async def call():
+            await self._throttle(prompt, generation_config['max_output_tokens'])
+            return await self.client.generate_content_async(
+                prompt, generation_config=generation_config, request_options=_GEMINI_REQUEST_OPTIONS
             )
-            text = response.text
-            # Extract JSON from markdown code blocks if present
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0].strip()
-            return json.loads(text)
+        
+        try:
+            response = await self._with_retries(call)
+            return self._extract_json(response.text)
         except Exception as e:
             logger.error(f"Gemini batch API error: {e}")
             return None
@@ -358,31 +696,36 @@ Do not include any other text, only the JSON object.
     def _call_ollama(self, prompt: str) -> Optional[dict]:
         """Call Ollama API (local)"""
         try:
-            response = self.client.generate(
+            response = self._with_retries_sync(lambda: self.client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
                     'temperature': self.temperature,
                     'num_predict': self.max_tokens,
                 }
-            )
+            ))
             text = response['response']
             return self._extract_json(text)
         except Exception as e:
             logger.error(f"Ollama API error: {e}")
             return None
     
-    def _call_ollama_batch(self, prompt: str) -> Optional[dict]:
-        """Call Ollama API for batch (local)"""
-        try:
-            response = self.client.generate(
+    async def _acall_ollama_batch(self, prompt: str) -> Optional[dict]:
+        """Call Ollama API for batch (local), keeping the model loaded between batches"""
+        async def call():
+            return await self.async_client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
                     'temperature': self.temperature,
                     'num_predict': self.max_tokens * 2,
-                }
+                    'num_ctx': self.num_ctx,
+                },
+                keep_alive=self.keep_alive
             )
+        
+        try:
+            response = await self._with_retries(call)
             text = response['response']
             return self._extract_json(text)
         except Exception as e:
@@ -394,27 +737,22 @@ Do not include any other text, only the JSON object.
         try:
             # Try direct JSON parse first
             return json.loads(text)
-        except:
+        except ValueError:
             pass
         
-        try:
-            # Extract from markdown code blocks
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0].strip()
-            return json.loads(text)
-        except:
-            pass
+        # Extract from markdown code blocks
+        if '```json' in text:
+            text = text.partition('```json')[2].partition('```')[0]
+        elif '```' in text:
+            text = text.partition('```')[2].partition('```')[0]
         
-        try:
-            # Find JSON object in text
-            import re
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-        except:
-            pass
+        # Decode the first complete JSON object in the text, however deeply nested
+        start = text.find('{')
+        while start != -1:
+            try:
+                return _JSON_DECODER.raw_decode(text, start)[0]
+            except ValueError:
+                start = text.find('{', start + 1)
         
         logger.debug(f"Could not extract JSON from response: {text[:200]}")
         return None
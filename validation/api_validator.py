@@ -1,10 +1,62 @@
 """Live API validation for secrets"""
 import asyncio
-from typing import List, Optional
+import hashlib
+import json
+import re
+import weakref
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from models.secret import Secret
 from core.logger import logger
 from core.config import Config
 
+try:
+    import h2  # noqa: F401 (enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+# Credentials validated as a pair: identifier type -> type of its secret half
+_PAIRED_TYPES = {
+    'aws_access_key': 'aws_secret_key',
+    'twilio_account_sid': 'twilio_auth_token',
+}
+_PAIR_HALVES = set(_PAIRED_TYPES) | set(_PAIRED_TYPES.values())
+
+# Halves are only paired when found in the same file within this many lines
+_PAIR_WINDOW = 20
+
+# The quoted key inside an aws_secret_key / twilio_auth_token match
+_AWS_SECRET_RE = re.compile(r"""['"]([0-9a-zA-Z/+]{40})['"]""")
+_TWILIO_TOKEN_RE = re.compile(r"""['"]([0-9a-zA-Z]{32})['"]""")
+
+# HTTP clients shared by all validators, one per event loop since a client
+# cannot outlive its loop; entries go away with their loop
+_HTTP_CLIENTS: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = \
+    weakref.WeakKeyDictionary()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the running loop's shared HTTP client, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _HTTP_CLIENTS[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=_HTTP2
+        )
+    return client
+
+
+async def _aclose_http_client():
+    """Close the running loop's shared HTTP client"""
+    client = _HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 class APIValidator:
     """Orchestrates live API validation"""
@@ -13,65 +65,206 @@ class APIValidator:
         self.config = config
         self.timeout = config.get('validation.api_timeout', 10)
         self.max_retries = config.get('validation.max_retries', 3)
-    
-    async def validate_secret(self, secret: Secret) -> Secret:
-        """Validate a single secret"""
-        validator_map = {
-            'aws_access_key': self._validate_aws,
-            'aws_secret_key': self._validate_aws,
+        self.executor_workers = config.get('validation.executor_workers', 32)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # GitHub /user responses by token hash, revalidated with their ETag (loaded on first use)
+        self._etag_path = self._github_etag_path()
+        self._etags: Optional[Dict[str, dict]] = None
+        self._etags_dirty = False
+        
+        # Single-secret validators by secret type, built once
+        self._validator_map = {
             'stripe_secret_key': self._validate_stripe,
             'stripe_restricted_key': self._validate_stripe,
             'github_token': self._validate_github,
             'github_oauth': self._validate_github,
-            'twilio_account_sid': self._validate_twilio,
-            'twilio_auth_token': self._validate_twilio,
             'slack_webhook': self._validate_slack_webhook,
             'slack_token': self._validate_slack_token,
         }
+    
+    def _github_etag_path(self) -> Optional[Path]:
+        """Locate the GitHub ETag cache if enabled in performance settings"""
+        if not self.config.get('performance.enable_cache', True):
+            return None
+        return Path(self.config.get('performance.cache_dir', '~/.sensit')).expanduser() / 'github_etag.json'
+    
+    def _github_etags(self) -> Dict[str, dict]:
+        """Get the GitHub ETag cache, loading it from disk on first use"""
+        if self._etags is None:
+            self._etags = {}
+            if self._etag_path is not None and self._etag_path.exists():
+                try:
+                    self._etags = json.loads(self._etag_path.read_text())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable GitHub ETag cache: {e}")
+        return self._etags
+    
+    def _save_github_etags(self):
+        """Write the GitHub ETag cache back to disk if it changed"""
+        if not self._etags_dirty or self._etag_path is None:
+            return
         
-        validator = validator_map.get(secret.type)
+        try:
+            # Replace the file in one step so a crash never leaves it half written
+            self._etag_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._etag_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._etags))
+            tmp_path.replace(self._etag_path)
+            self._etags_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save GitHub ETag cache: {e}")
+    
+    async def _run_blocking(self, call: Callable):
+        """Run a blocking SDK call on the validator's thread pool, creating it on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.executor_workers,
+                                                thread_name_prefix='sensit-api')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+    
+    async def aclose(self):
+        """Close the shared HTTP client and thread pool, and save the GitHub ETag cache"""
+        self._save_github_etags()
+        await _aclose_http_client()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    async def validate_secret(self, secret: Secret) -> Secret:
+        """Validate a single secret (paired credentials are validated by validate_batch)"""
+        validator = self._validator_map.get(secret.type)
         
         if validator:
             try:
                 is_valid, details = await validator(secret)
-                secret.api_valid = is_valid
-                secret.api_details = details
-                
-                if is_valid:
-                    secret.status = "CONFIRMED"
-                    secret.severity = "CRITICAL"
-                    logger.info(f"✓ Confirmed valid {secret.type}")
-                else:
-                    logger.debug(f"✗ Invalid {secret.type}")
-                    
+                self._record_result(secret, is_valid, details)
             except Exception as e:
                 logger.error(f"API validation error for {secret.type}: {e}")
                 secret.api_valid = None
         
         return secret
     
+    async def validate_pair(self, identifier: Secret, key: Secret) -> Tuple[Secret, Secret]:
+        """Validate a paired credential (AWS access key + secret key, Twilio SID + auth token)"""
+        validator = self._validate_aws if identifier.type == 'aws_access_key' else self._validate_twilio
+        
+        try:
+            is_valid, details = await validator(identifier, key)
+            self._record_result(identifier, is_valid, details)
+            self._record_result(key, is_valid, details)
+        except Exception as e:
+            logger.error(f"API validation error for {identifier.type}: {e}")
+        
+        return identifier, key
+    
+    def _record_result(self, secret: Secret, is_valid: bool, details: dict):
+        """Store a validation result on a secret"""
+        secret.api_valid = is_valid
+        secret.api_details = details
+        
+        if is_valid:
+            secret.status = "CONFIRMED"
+            secret.severity = "CRITICAL"
+            logger.info(f"✓ Confirmed valid {secret.type}")
+        else:
+            logger.debug(f"✗ Invalid {secret.type}")
+    
     async def validate_batch(self, secrets: List[Secret]) -> List[Secret]:
-        """Validate multiple secrets concurrently"""
-        tasks = [self.validate_secret(secret) for secret in secrets]
-        return await asyncio.gather(*tasks)
+        """Validate multiple secrets concurrently, checking each distinct credential once"""
+        # One call per distinct paired credential; unpaired halves cannot be checked at all
+        pairs: Dict[Tuple[str, str, str], List[Tuple[Secret, Secret]]] = {}
+        for identifier, key in self._pair_credentials(secrets):
+            pairs.setdefault((identifier.type, identifier.value, key.value), []).append((identifier, key))
+        
+        # One call per distinct (type, value) of everything else
+        singles: Dict[Tuple[str, str], List[Secret]] = {}
+        for secret in secrets:
+            if secret.type not in _PAIR_HALVES:
+                singles.setdefault((secret.type, secret.value), []).append(secret)
+        
+        async def validate_pair_group(group: List[Tuple[Secret, Secret]]):
+            identifier, key = group[0]
+            await self.validate_pair(identifier, key)
+            for other_identifier, other_key in group[1:]:
+                self._copy_result(identifier, other_identifier)
+                self._copy_result(key, other_key)
+        
+        async def validate_single_group(group: List[Secret]):
+            await self.validate_secret(group[0])
+            for other in group[1:]:
+                self._copy_result(group[0], other)
+        
+        tasks = [validate_pair_group(group) for group in pairs.values()]
+        tasks.extend(validate_single_group(group) for group in singles.values())
+        
+        await asyncio.gather(*tasks)
+        return secrets
+    
+    @staticmethod
+    def _copy_result(source: Secret, target: Secret):
+        """Give a duplicate of a validated secret the same result"""
+        target.api_valid = source.api_valid
+        target.api_details = source.api_details
+        
+        if source.api_valid:
+            target.status = source.status
+            target.severity = source.severity
     
-    async def _validate_aws(self, secret: Secret) -> tuple[bool, dict]:
-        """Validate AWS credentials"""
+    @staticmethod
+    def _pair_credentials(secrets: List[Secret]) -> List[Tuple[Secret, Secret]]:
+        """Pair each credential identifier with the nearest unpaired secret half in the same file"""
+        halves: Dict[Tuple[str, str], List[Secret]] = {}
+        for secret in secrets:
+            if secret.type in _PAIR_HALVES:
+                halves.setdefault((secret.location, secret.type), []).append(secret)
+        
+        pairs = []
+        for secret in secrets:
+            key_type = _PAIRED_TYPES.get(secret.type)
+            candidates = halves.get((secret.location, key_type)) if key_type else None
+            if not candidates:
+                continue
+            
+            nearest = min(candidates, key=lambda key: abs(key.line_number - secret.line_number))
+            if abs(nearest.line_number - secret.line_number) <= _PAIR_WINDOW:
+                candidates.remove(nearest)
+                pairs.append((secret, nearest))
+        
+        return pairs
+    
+    async def _validate_aws(self, access_key: Secret, secret_key: Secret) -> tuple[bool, dict]:
+        """Validate AWS credentials with STS GetCallerIdentity"""
         try:
             import boto3
+            from botocore.config import Config as BotoConfig
             from botocore.exceptions import ClientError
-            
-            # Extract access key and secret key
-            # This is simplified - in production, you'd need to pair them
-            if secret.type == 'aws_access_key':
-                # Try to use STS GetCallerIdentity
-                # Note: This requires both access key and secret key
-                return False, {'error': 'Requires secret key pair'}
-            
-            return False, {'error': 'Not implemented'}
-            
         except ImportError:
             return False, {'error': 'boto3 not installed'}
+        
+        match = _AWS_SECRET_RE.search(secret_key.value)
+        if not match:
+            return False, {'error': 'Could not extract secret access key'}
+        
+        def get_caller_identity():
+            sts = boto3.client(
+                'sts',
+                aws_access_key_id=access_key.value,
+                aws_secret_access_key=match.group(1),
+                config=BotoConfig(connect_timeout=self.timeout, read_timeout=self.timeout,
+                                  retries={'max_attempts': self.max_retries})
+            )
+            return sts.get_caller_identity()
+        
+        try:
+            # boto3 is blocking, so run it off the event loop
+            identity = await self._run_blocking(get_caller_identity)
+            return True, {
+                'valid': True,
+                'account': identity.get('Account'),
+                'arn': identity.get('Arn')
+            }
+        except ClientError as e:
+            return False, {'error': e.response.get('Error', {}).get('Code', str(e))}
         except Exception as e:
             return False, {'error': str(e)}
     
@@ -81,10 +274,8 @@ class APIValidator:
         try:
             import stripe
             
-            stripe.api_key = secret.value
-            
-            # Try to retrieve balance
-            balance = stripe.Balance.retrieve()
+            # Try to retrieve balance (the key is passed per request, as calls run in parallel threads)
+            balance = await self._run_blocking(lambda: stripe.Balance.retrieve(api_key=secret.value))
             
             return True, {
                 'valid': True,
@@ -100,55 +291,88 @@ class APIValidator:
             return False, {'error': str(e)}
     
     async def _validate_github(self, secret: Secret) -> tuple[bool, dict]:
-        """Validate GitHub token"""
+        """
+        Validate GitHub token. The last response for a token is kept with its
+        ETag, so revalidating an unchanged token gets a bodiless 304 that does
+        not count against the rate limit. Tokens are only stored hashed.
+        """
         try:
-            import requests
-            
             headers = {
                 'Authorization': f'token {secret.value}',
                 'Accept': 'application/vnd.github.v3+json'
             }
             
-            response = requests.get(
+            etags = self._github_etags()
+            token_hash = hashlib.sha256(secret.value.encode()).hexdigest()
+            cached = etags.get(token_hash)
+            if cached:
+                headers['If-None-Match'] = cached['etag']
+            
+            response = await _get_http_client().get(
                 'https://api.github.com/user',
                 headers=headers,
                 timeout=self.timeout
             )
             
+            if response.status_code == 304 and cached:
+                return True, cached['details']
+            
             if response.status_code == 200:
                 user_data = response.json()
-                return True, {
+                details = {
                     'valid': True,
                     'username': user_data.get('login'),
                     'user_id': user_data.get('id'),
                     'scopes': response.headers.get('X-OAuth-Scopes', '')
                 }
+                
+                etag = response.headers.get('ETag')
+                if etag:
+                    etags[token_hash] = {'etag': etag, 'details': details}
+                    self._etags_dirty = True
+                return True, details
             else:
+                # Forget revoked tokens
+                if response.status_code == 401 and etags.pop(token_hash, None) is not None:
+                    self._etags_dirty = True
                 return False, {'error': f'HTTP {response.status_code}'}
                 
         except Exception as e:
             return False, {'error': str(e)}
     
-    async def _validate_twilio(self, secret: Secret) -> tuple[bool, dict]:
-        """Validate Twilio credentials"""
+    async def _validate_twilio(self, account_sid: Secret, auth_token: Secret) -> tuple[bool, dict]:
+        """Validate Twilio credentials by fetching the account"""
         try:
             from twilio.rest import Client
-            
-            # This is simplified - needs account SID + auth token pair
-            return False, {'error': 'Requires SID and token pair'}
-            
+            from twilio.base.exceptions import TwilioRestException
         except ImportError:
             return False, {'error': 'twilio not installed'}
+        
+        match = _TWILIO_TOKEN_RE.search(auth_token.value)
+        if not match:
+            return False, {'error': 'Could not extract auth token'}
+        
+        def fetch_account():
+            return Client(account_sid.value, match.group(1)).api.accounts(account_sid.value).fetch()
+        
+        try:
+            # The Twilio SDK is blocking, so run it off the event loop
+            account = await self._run_blocking(fetch_account)
+            return True, {
+                'valid': True,
+                'friendly_name': account.friendly_name,
+                'status': account.status
+            }
+        except TwilioRestException as e:
+            return False, {'error': f'HTTP {e.status}'}
         except Exception as e:
             return False, {'error': str(e)}
     
     async def _validate_slack_webhook(self, secret: Secret) -> tuple[bool, dict]:
         """Validate Slack webhook"""
         try:
-            import requests
-            
             # Send test message
-            response = requests.post(
+            response = await _get_http_client().post(
                 secret.value,
                 json={'text': 'SenSIt validation test (please ignore)'},
                 timeout=self.timeout
@@ -165,11 +389,9 @@ class APIValidator:
     async def _validate_slack_token(self, secret: Secret) -> tuple[bool, dict]:
         """Validate Slack API token"""
         try:
-            import requests
-            
             headers = {'Authorization': f'Bearer {secret.value}'}
             
-            response = requests.get(
+            response = await _get_http_client().get(
                 'https://slack.com/api/auth.test',
                 headers=headers,
                 timeout=self.timeout